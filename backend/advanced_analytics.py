@@ -5,23 +5,244 @@ Provides deep cost analysis, ML-based insights, and predictive analytics
 
 import logging
 import numpy as np
-from typing import List, Dict, Any, Tuple
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import pandas as pd
 from scipy import stats
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _daily_sum(cost_data: pd.DataFrame, column: str = "cost") -> Tuple[pd.Index, np.ndarray]:
+    """
+    Sum a column per date with a single factorize + bincount pass
+    
+    The returned array is read-only, so one result can be passed safely to
+    several analytics methods.
+    
+    Args:
+        cost_data: DataFrame with a date column
+        column: Column to sum
+    
+    Returns:
+        Tuple of (sorted unique dates, per-date sums)
+    """
+    dates = cost_data["date"]
+    tz = getattr(dates.dtype, "tz", None)
+    if tz is not None:
+        # Factorizing tz-aware values is several times slower; group on the
+        # naive UTC values and restore the timezone on the (small) uniques
+        codes, uniques = pd.factorize(dates.values, sort=True)
+        uniques = pd.DatetimeIndex(uniques).tz_localize("UTC").tz_convert(tz)
+    else:
+        codes, uniques = pd.factorize(dates, sort=True)
+    weights = cost_data[column].to_numpy(dtype=np.float64)
+    valid = codes >= 0
+    if not valid.all():
+        codes, weights = codes[valid], weights[valid]
+    sums = np.bincount(codes, weights=weights, minlength=len(uniques))
+    sums.flags.writeable = False
+    return uniques, sums
+
+
+def _quartiles(costs: np.ndarray) -> Tuple[float, float]:
+    """
+    Return (Q1, Q3) with np.percentile's linear interpolation, using a
+    single O(N) partition instead of a full sort
+    """
+    n = len(costs)
+    pos1 = 0.25 * (n - 1)
+    pos3 = 0.75 * (n - 1)
+    lo1, lo3 = int(pos1), int(pos3)
+    hi1, hi3 = min(lo1 + 1, n - 1), min(lo3 + 1, n - 1)
+    part = np.partition(costs, sorted({lo1, hi1, lo3, hi3}))
+    Q1 = part[lo1] + (part[hi1] - part[lo1]) * (pos1 - lo1)
+    Q3 = part[lo3] + (part[hi3] - part[lo3]) * (pos3 - lo3)
+    return Q1, Q3
+
+
+def _iqr_mask_numpy(costs: np.ndarray) -> np.ndarray:
+    """Flag values outside 1.5 * IQR of the quartiles"""
+    if len(costs) == 0:
+        return np.zeros(0, dtype=bool)
+    Q1, Q3 = _quartiles(costs)
+    IQR = Q3 - Q1
+    lower_bound = Q1 - 1.5 * IQR
+    upper_bound = Q3 + 1.5 * IQR
+    return (costs < lower_bound) | (costs > upper_bound)
+
+
+def _zscore_mask_numpy(costs: np.ndarray, threshold: float) -> np.ndarray:
+    """Flag values whose absolute z-score exceeds threshold"""
+    return np.abs(stats.zscore(costs)) > threshold
+
+
+def _iqr_mask_kernel(costs):
+    """Flag values outside 1.5 * IQR using a single sort (numba-compilable)"""
+    n = costs.shape[0]
+    mask = np.zeros(n, dtype=np.bool_)
+    if n == 0:
+        return mask
+    ordered = np.sort(costs)
+
+    # Linear interpolation, matching np.percentile's default
+    pos = 0.25 * (n - 1)
+    lo = int(pos)
+    hi = min(lo + 1, n - 1)
+    q1 = ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+    pos = 0.75 * (n - 1)
+    lo = int(pos)
+    hi = min(lo + 1, n - 1)
+    q3 = ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+    iqr = q3 - q1
+    lower_bound = q1 - 1.5 * iqr
+    upper_bound = q3 + 1.5 * iqr
+    for i in range(n):
+        mask[i] = costs[i] < lower_bound or costs[i] > upper_bound
+    return mask
+
+
+def _zscore_mask_kernel(costs, threshold):
+    """Flag values whose absolute z-score exceeds threshold (numba-compilable)"""
+    n = costs.shape[0]
+    mask = np.zeros(n, dtype=np.bool_)
+    if n == 0:
+        return mask
+    total = 0.0
+    for i in range(n):
+        total += costs[i]
+    mean = total / n
+    m2 = 0.0
+    for i in range(n):
+        d = costs[i] - mean
+        m2 += d * d
+    std = np.sqrt(m2 / n)
+    if std == 0.0:
+        return mask
+    for i in range(n):
+        mask[i] = abs(costs[i] - mean) / std > threshold
+    return mask
+
+
+def _welford_kernel(values):
+    """Single-pass, numerically stable mean and sum of squared deviations (numba-compilable)"""
+    mean = 0.0
+    m2 = 0.0
+    for i in range(values.shape[0]):
+        x = values[i]
+        d = x - mean
+        mean += d / (i + 1)
+        m2 += (x - mean) * d
+    return mean, m2
+
+
+def _welford_numpy(values: np.ndarray) -> Tuple[float, float]:
+    """Mean and sum of squared deviations with numpy"""
+    mean = values.mean()
+    return mean, float(np.dot(values - mean, values - mean))
+
+
+# Kernel selection: ahead-of-time compiled module (see analytics_aot.py), then
+# numba JIT, then the numpy/scipy implementation
+try:
+    from _analytics_kernels import (
+        iqr_mask as _iqr_mask,
+        zscore_mask as _zscore_mask,
+        welford as _welford,
+    )
+    KERNEL_BACKEND = "aot"
+except ImportError:
+    if NUMBA_AVAILABLE:
+        _iqr_mask = njit(cache=True, fastmath=True)(_iqr_mask_kernel)
+        _zscore_mask = njit(cache=True, fastmath=True)(_zscore_mask_kernel)
+        # No fastmath: reassociating the update would defeat Welford's stability
+        _welford = njit(cache=True)(_welford_kernel)
+        KERNEL_BACKEND = "numba"
+    else:
+        _iqr_mask = _iqr_mask_numpy
+        _zscore_mask = _zscore_mask_numpy
+        _welford = _welford_numpy
+        KERNEL_BACKEND = "numpy"
+
+
+def _mean_std(values: np.ndarray, ddof: int = 0) -> Tuple[float, float]:
+    """
+    Mean and standard deviation from a single Welford pass
+    
+    Args:
+        values: 1-D float64 array
+        ddof: Delta degrees of freedom for the standard deviation
+    
+    Returns:
+        Tuple of (mean, std); NaN where undefined for the sample size
+    """
+    n = len(values)
+    if n == 0:
+        return float("nan"), float("nan")
+    mean, m2 = _welford(values)
+    if not np.isfinite(mean):
+        # Welford's update turns an inf input into NaN; keep numpy's semantics
+        mean, m2 = _welford_numpy(values)
+    std = float(np.sqrt(m2 / (n - ddof))) if n > ddof else float("nan")
+    return float(mean), std
+
+
+@lru_cache(maxsize=64)
+def _iforest_predict(costs_bytes: bytes, n: int, contamination: float) -> bytes:
+    """
+    Fit an IsolationForest and return its predictions, memoized per input
+    
+    Args:
+        costs_bytes: Raw float32 buffer of daily costs
+        n: Number of daily costs
+        contamination: Expected proportion of anomalies
+    
+    Returns:
+        Raw int8 buffer of predictions (-1 for anomalies, 1 otherwise)
+    """
+    from joblib import parallel_backend
+    from sklearn.ensemble import IsolationForest
+    costs = np.frombuffer(costs_bytes, dtype=np.float32).reshape(n, 1)
+    with parallel_backend("threading", n_jobs=-1):
+        iso_forest = IsolationForest(contamination=contamination, random_state=42, n_jobs=-1)
+        predictions = iso_forest.fit_predict(costs)
+    return predictions.astype(np.int8).tobytes()
+
+
 class AdvancedAnalytics:
     """Advanced analytics for AWS cost optimization"""
 
+    @staticmethod
+    def daily_costs(cost_data: pd.DataFrame) -> Tuple[pd.Index, np.ndarray]:
+        """
+        Total cost per date
+        
+        Compute this once and pass it to detect_cost_anomalies_advanced and
+        forecast_with_confidence_intervals to share a single aggregation.
+        
+        Args:
+            cost_data: DataFrame with cost data
+        
+        Returns:
+            Tuple of (sorted unique dates, read-only per-date costs)
+        """
+        return _daily_sum(cost_data, "cost")
+
     @staticmethod
     def detect_cost_anomalies_advanced(
         cost_data: pd.DataFrame,
         method: str = "isolation_forest",
-        contamination: float = 0.1
+        contamination: float = 0.1,
+        daily_costs: Optional[Tuple[pd.Index, np.ndarray]] = None
     ) -> List[Dict[str, Any]]:
         """
         Detect cost anomalies using advanced statistical methods
@@ -30,6 +251,7 @@ class AdvancedAnalytics:
             cost_data: DataFrame with cost data
             method: Detection method (isolation_forest, zscore, iqr)
             contamination: Expected proportion of anomalies
+            daily_costs: Precomputed daily_costs(cost_data), if already available
         
         Returns:
             List of detected anomalies with details
@@ -38,48 +260,47 @@ class AdvancedAnalytics:
             if cost_data.empty:
                 return []
 
-            daily_costs = cost_data.groupby("date")["cost"].sum()
-            costs = daily_costs.values.reshape(-1, 1)
+            dates, daily_sums = daily_costs if daily_costs is not None else _daily_sum(cost_data)
 
-            anomalies = []
+            # Nothing can stand out in a single day or a flat series
+            if len(daily_sums) < 2 or daily_sums.min() == daily_sums.max():
+                return []
 
             if method == "zscore":
-                z_scores = np.abs(stats.zscore(costs))
                 threshold = 3
-                anomaly_indices = np.where(z_scores > threshold)[0]
+                anomaly_indices = np.flatnonzero(_zscore_mask(daily_sums, threshold))
 
             elif method == "iqr":
-                Q1 = np.percentile(costs, 25)
-                Q3 = np.percentile(costs, 75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                anomaly_indices = np.where((costs < lower_bound) | (costs > upper_bound))[0]
+                anomaly_indices = np.flatnonzero(_iqr_mask(daily_sums))
 
             else:  # isolation_forest
                 try:
-                    from sklearn.ensemble import IsolationForest
-                    iso_forest = IsolationForest(contamination=contamination, random_state=42)
-                    predictions = iso_forest.fit_predict(costs)
+                    # The forest's trees work in float32 internally; handing it
+                    # float32 avoids a conversion copy and halves the cache key
+                    costs_f32 = np.ascontiguousarray(daily_sums, dtype=np.float32)
+                    predictions = np.frombuffer(
+                        _iforest_predict(costs_f32.tobytes(), len(costs_f32), contamination),
+                        dtype=np.int8,
+                    )
                     anomaly_indices = np.where(predictions == -1)[0]
                 except ImportError:
                     logger.warning("scikit-learn not installed, using IQR method")
-                    Q1 = np.percentile(costs, 25)
-                    Q3 = np.percentile(costs, 75)
-                    IQR = Q3 - Q1
-                    lower_bound = Q1 - 1.5 * IQR
-                    upper_bound = Q3 + 1.5 * IQR
-                    anomaly_indices = np.where((costs < lower_bound) | (costs > upper_bound))[0]
+                    anomaly_indices = np.flatnonzero(_iqr_mask(daily_sums))
 
             # Build anomaly details
-            dates = daily_costs.index
-            for idx in anomaly_indices:
-                anomalies.append({
-                    "date": dates[idx].isoformat(),
-                    "cost": float(costs[idx][0]),
+            high_threshold = daily_sums.mean() * 1.5
+            sel_costs = daily_sums[anomaly_indices]
+            sel_dates = dates[anomaly_indices]
+            severities = np.where(sel_costs > high_threshold, "high", "medium")
+            anomalies = [
+                {
+                    "date": date.isoformat(),
+                    "cost": cost,
                     "method": method,
-                    "severity": "high" if costs[idx][0] > np.mean(costs) * 1.5 else "medium",
-                })
+                    "severity": severity,
+                }
+                for date, cost, severity in zip(sel_dates, sel_costs.tolist(), severities.tolist())
+            ]
 
             logger.info(f"Detected {len(anomalies)} anomalies using {method}")
             return anomalies
@@ -116,24 +337,45 @@ class AdvancedAnalytics:
                 return {}
 
             # Group by date
-            daily_costs = data.groupby("date")["cost"].sum()
-            daily_usage = data.groupby("date")["usage"].sum()
-
-            # Calculate percentage changes
-            cost_pct_change = daily_costs.pct_change().dropna()
-            usage_pct_change = daily_usage.pct_change().dropna()
+            _, daily_costs = _daily_sum(data, "cost")
+            _, daily_usage = _daily_sum(data, "usage")
+
+            # No day-over-day change to measure
+            if len(daily_costs) < 2:
+                return {
+                    "elasticity": 0.0,
+                    "cost_volatility": float("nan"),
+                    "usage_volatility": float("nan"),
+                    "correlation": float("nan"),
+                    "service": service or "all",
+                }
+
+            # Calculate percentage changes (dropping 0/0 like pct_change().dropna())
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cost_pct_change = daily_costs[1:] / daily_costs[:-1] - 1.0
+                usage_pct_change = daily_usage[1:] / daily_usage[:-1] - 1.0
+            cost_pct_change = cost_pct_change[~np.isnan(cost_pct_change)]
+            usage_pct_change = usage_pct_change[~np.isnan(usage_pct_change)]
 
             # Calculate elasticity
+            cost_mean, cost_std = _mean_std(cost_pct_change, ddof=1)
+            usage_mean, usage_std = _mean_std(usage_pct_change, ddof=1)
             if len(cost_pct_change) > 0 and len(usage_pct_change) > 0:
-                elasticity = cost_pct_change.mean() / usage_pct_change.mean() if usage_pct_change.mean() != 0 else 0
+                elasticity = cost_mean / usage_mean if usage_mean != 0 else 0
             else:
                 elasticity = 0
 
+            # Pearson correlation; both series share the same date index
+            cost_dev = daily_costs - daily_costs.mean()
+            usage_dev = daily_usage - daily_usage.mean()
+            denom = np.sqrt(np.dot(cost_dev, cost_dev) * np.dot(usage_dev, usage_dev))
+            correlation = np.dot(cost_dev, usage_dev) / denom if denom > 0 else np.nan
+
             return {
                 "elasticity": float(elasticity),
-                "cost_volatility": float(cost_pct_change.std()),
-                "usage_volatility": float(usage_pct_change.std()),
-                "correlation": float(daily_costs.corr(daily_usage)),
+                "cost_volatility": cost_std,
+                "usage_volatility": usage_std,
+                "correlation": float(correlation),
                 "service": service or "all",
             }
 
@@ -145,7 +387,8 @@ class AdvancedAnalytics:
     def forecast_with_confidence_intervals(
         cost_data: pd.DataFrame,
         days_ahead: int = 30,
-        confidence: float = 0.95
+        confidence: float = 0.95,
+        daily_costs: Optional[Tuple[pd.Index, np.ndarray]] = None
     ) -> List[Dict[str, Any]]:
         """
         Generate cost forecasts with confidence intervals
@@ -154,6 +397,7 @@ class AdvancedAnalytics:
             cost_data: DataFrame with cost data
             days_ahead: Number of days to forecast
             confidence: Confidence level (0.95 = 95%)
+            daily_costs: Precomputed daily_costs(cost_data), if already available
         
         Returns:
             List of forecasts with confidence intervals
@@ -162,46 +406,49 @@ class AdvancedAnalytics:
             if cost_data.empty:
                 return []
 
-            daily_costs = cost_data.groupby("date")["cost"].sum()
+            dates, y = daily_costs if daily_costs is not None else _daily_sum(cost_data)
 
-            # Calculate statistics
-            mean = daily_costs.mean()
-            std = daily_costs.std()
-            n = len(daily_costs)
+            # A trend needs at least two days
+            n = len(y)
+            if n < 2:
+                return []
 
-            # Calculate trend
-            x = np.arange(n)
-            y = daily_costs.values
-            coeffs = np.polyfit(x, y, 1)
-            poly = np.poly1d(coeffs)
+            # Calculate trend (closed-form least squares)
+            x = np.arange(n, dtype=np.float64)
+            sx = x.sum()
+            sy = y.sum()
+            sxx = np.dot(x, x)
+            sxy = np.dot(x, y)
+            denom = n * sxx - sx * sx
+            slope = (n * sxy - sx * sy) / denom if denom != 0 else 0.0
+            intercept = (sy - slope * sx) / n
 
             # Calculate residuals
-            residuals = y - poly(x)
-            residual_std = np.std(residuals)
+            residuals = y - (slope * x + intercept)
+            _, residual_std = _mean_std(residuals)
 
             # Z-score for confidence interval
             z_score = stats.norm.ppf((1 + confidence) / 2)
 
             # Generate forecast
-            forecast = []
-            last_date = daily_costs.index[-1]
-
-            for i in range(1, days_ahead + 1):
-                forecast_date = last_date + timedelta(days=i)
-                forecast_value = poly(n + i - 1)
-
-                # Calculate confidence interval
-                margin_of_error = z_score * residual_std * np.sqrt(1 + 1/n)
-                lower_bound = max(0, forecast_value - margin_of_error)
-                upper_bound = forecast_value + margin_of_error
-
-                forecast.append({
+            forecast_values = slope * np.arange(n, n + days_ahead, dtype=np.float64) + intercept
+            margin_of_error = z_score * residual_std * np.sqrt(1 + 1/n)
+            lower_bounds = np.maximum(0, forecast_values - margin_of_error)
+            upper_bounds = forecast_values + margin_of_error
+
+            forecast_dates = dates[-1] + pd.to_timedelta(np.arange(1, days_ahead + 1), unit="D")
+            forecast = [
+                {
                     "date": forecast_date.isoformat(),
-                    "forecasted_cost": float(forecast_value),
-                    "lower_bound": float(lower_bound),
-                    "upper_bound": float(upper_bound),
+                    "forecasted_cost": forecast_value,
+                    "lower_bound": lower_bound,
+                    "upper_bound": upper_bound,
                     "confidence": confidence,
-                })
+                }
+                for forecast_date, forecast_value, lower_bound, upper_bound in zip(
+                    forecast_dates, forecast_values.tolist(), lower_bounds.tolist(), upper_bounds.tolist()
+                )
+            ]
 
             logger.info(f"Generated {len(forecast)} forecasts with confidence intervals")
             return forecast
@@ -230,34 +477,29 @@ class AdvancedAnalytics:
                 return []
 
             # Group by service and region
-            drivers = cost_data.groupby(["service", "region"]).agg({
-                "cost": ["sum", "mean", "std"],
-                "usage": "sum"
-            }).reset_index()
-
-            drivers.columns = ["service", "region", "total_cost", "avg_cost", "std_cost", "total_usage"]
+            drivers = cost_data.groupby(["service", "region"], sort=False, observed=True).agg(
+                total_cost=("cost", "sum"),
+                avg_cost=("cost", "mean"),
+                std_cost=("cost", "std"),
+                total_usage=("usage", "sum"),
+            ).reset_index()
 
             # Calculate metrics
             total_cost = drivers["total_cost"].sum()
-            drivers["percentage"] = (drivers["total_cost"] / total_cost * 100) if total_cost > 0 else 0
-            drivers["cumulative_percentage"] = drivers["percentage"].cumsum()
-            drivers["cost_per_unit"] = (drivers["total_cost"] / drivers["total_usage"]
-                                       if drivers["total_usage"] > 0 else 0)
+            drivers["percentage"] = (drivers["total_cost"] / total_cost * 100) if total_cost > 0 else 0.0
+            tc = drivers["total_cost"].to_numpy(dtype=np.float64)
+            tu = drivers["total_usage"].to_numpy(dtype=np.float64)
+            drivers["cost_per_unit"] = np.where(tu > 0, tc / np.where(tu > 0, tu, 1), 0.0)
 
             # Sort by cost
-            drivers = drivers.sort_values("total_cost", ascending=False).head(top_n)
-
-            result = []
-            for _, row in drivers.iterrows():
-                result.append({
-                    "service": row["service"],
-                    "region": row["region"],
-                    "total_cost": float(row["total_cost"]),
-                    "percentage": float(row["percentage"]),
-                    "cumulative_percentage": float(row["cumulative_percentage"]),
-                    "cost_per_unit": float(row["cost_per_unit"]),
-                    "volatility": float(row["std_cost"]),
-                })
+            drivers = drivers.sort_values("total_cost", ascending=False)
+            drivers["cumulative_percentage"] = drivers["percentage"].cumsum()
+            drivers = drivers.head(top_n)
+
+            result = drivers[
+                ["service", "region", "total_cost", "percentage",
+                 "cumulative_percentage", "cost_per_unit", "std_cost"]
+            ].rename(columns={"std_cost": "volatility"}).to_dict("records")
 
             logger.info(f"Identified {len(result)} top cost drivers")
             return result
@@ -330,26 +572,28 @@ class AdvancedAnalytics:
                 "cost_range": 0,
             }
 
-            costs = []
-            for scenario in scenarios:
-                cost = scenario.get("cost", 0)
-                costs.append(cost)
+            min_cost = float("inf")
+            max_cost = float("-inf")
+            total_cost = 0.0
+            min_idx = max_idx = 0
+            for idx, scenario in enumerate(scenarios):
+                cost = float(scenario.get("cost", 0))
+                total_cost += cost
+                if cost < min_cost:
+                    min_cost, min_idx = cost, idx
+                if cost > max_cost:
+                    max_cost, max_idx = cost, idx
                 comparison["scenarios"].append({
                     "name": scenario.get("name", "Unknown"),
-                    "cost": float(cost),
+                    "cost": cost,
                     "description": scenario.get("description", ""),
                 })
 
-            if costs:
-                min_cost = min(costs)
-                max_cost = max(costs)
-                avg_cost = sum(costs) / len(costs)
-
-                comparison["best_scenario"] = scenarios[costs.index(min_cost)].get("name")
-                comparison["worst_scenario"] = scenarios[costs.index(max_cost)].get("name")
-                comparison["average_cost"] = float(avg_cost)
-                comparison["cost_range"] = float(max_cost - min_cost)
-                comparison["savings_potential"] = float(max_cost - min_cost)
+            comparison["best_scenario"] = scenarios[min_idx].get("name")
+            comparison["worst_scenario"] = scenarios[max_idx].get("name")
+            comparison["average_cost"] = total_cost / len(scenarios)
+            comparison["cost_range"] = max_cost - min_cost
+            comparison["savings_potential"] = max_cost - min_cost
 
             logger.info(f"Compared {len(scenarios)} scenarios")
             return comparison
@@ -383,19 +627,18 @@ class AdvancedAnalytics:
             cost_per_unit = (total_cost / total_usage) if total_usage > 0 else 0
 
             # Calculate by service
-            service_economics = []
-            for service in cost_data["service"].unique():
-                service_data = cost_data[cost_data["service"] == service]
-                service_cost = service_data["cost"].sum()
-                service_usage = service_data["usage"].sum()
-                service_cpu = (service_cost / service_usage) if service_usage > 0 else 0
-
-                service_economics.append({
-                    "service": service,
-                    "cost_per_unit": float(service_cpu),
-                    "total_cost": float(service_cost),
-                    "total_usage": float(service_usage),
-                })
+            by_service = cost_data.groupby("service", sort=False, observed=True).agg(
+                total_cost=("cost", "sum"),
+                total_usage=("usage", "sum"),
+            )
+            service_cost = by_service["total_cost"].to_numpy(dtype=np.float64)
+            service_usage = by_service["total_usage"].to_numpy(dtype=np.float64)
+            by_service["cost_per_unit"] = np.where(
+                service_usage > 0, service_cost / np.where(service_usage > 0, service_usage, 1), 0.0
+            )
+            service_economics = by_service.reset_index()[
+                ["service", "cost_per_unit", "total_cost", "total_usage"]
+            ].to_dict("records")
 
             return {
                 "overall_cost_per_unit": float(cost_per_unit),
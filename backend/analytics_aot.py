@@ -0,0 +1,34 @@
+"""
+Analytics AOT Build Module
+Ahead-of-time compiles the anomaly detection kernels with numba.pycc
+
+Flask workers otherwise pay numba's JIT warm-up on the first request that
+hits each kernel. Run this once at build time, from the backend directory:
+
+    python analytics_aot.py
+
+It writes the _analytics_kernels extension module next to
+advanced_analytics.py, which picks it up automatically.
+"""
+
+import logging
+import os
+
+from numba.pycc import CC
+
+from advanced_analytics import _iqr_mask_kernel, _welford_kernel, _zscore_mask_kernel
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+cc = CC("_analytics_kernels")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export("iqr_mask", "b1[:](f8[:])")(_iqr_mask_kernel)
+cc.export("zscore_mask", "b1[:](f8[:], f8)")(_zscore_mask_kernel)
+cc.export("welford", "UniTuple(f8, 2)(f8[:])")(_welford_kernel)
+
+
+if __name__ == "__main__":
+    cc.compile()
+    logger.info(f"Compiled analytics kernels into {cc.output_dir}")
@@ -7,7 +7,7 @@ import os
 import logging
 import uuid
 from datetime import datetime
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, Response, request, jsonify, render_template, send_from_directory, stream_with_context
 from flask_cors import CORS
 from dotenv import load_dotenv
 from finops_chatbot import FinOpsChatbot
@@ -17,20 +17,23 @@ from scheduler import DataSyncScheduler
 from advanced_analytics import AdvancedAnalytics
 import pandas as pd
 from email_routes import email_bp
+from json_provider import init_json_provider
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
+# Configure logging; force replaces any handler a library module installed at import
 logging.basicConfig(
     level=config.LOG_LEVEL,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    force=True
 )
 logger = logging.getLogger(__name__)
 
 # Initialize Flask app
 app = Flask(__name__, template_folder='templates', static_folder='static')
 app.config['SECRET_KEY'] = config.SECRET_KEY
+init_json_provider(app)
 CORS(app, resources={
     r"/api/*": {
         "origins": ["http://localhost:3000"],
@@ -43,8 +46,8 @@ app.register_blueprint(email_bp)
 
 
 # Initialize components
-chatbot = FinOpsChatbot()
 db_manager = DatabaseManager()
+chatbot = FinOpsChatbot(db_manager=db_manager)
 data_sync_scheduler = DataSyncScheduler(chatbot)
 analytics = AdvancedAnalytics()
 
@@ -54,6 +57,13 @@ if config.ENABLE_SCHEDULER:
     data_sync_scheduler.schedule_daily_sync(hour=config.SYNC_HOUR, minute=config.SYNC_MINUTE)
     logger.info("Data sync scheduler started")
 
+# Prune aged-out records in the background
+if config.RETENTION_DAYS > 0:
+    db_manager.start_retention_janitor(
+        days=config.RETENTION_DAYS,
+        interval_seconds=config.RETENTION_INTERVAL_HOURS * 3600
+    )
+
 
 @app.route("/", methods=["GET"])
 def index():
@@ -180,6 +190,30 @@ def get_insights():
         return jsonify({"status": "error", "message": str(e)}), 500
 
 
+@app.route("/api/cost-records", methods=["GET"])
+def get_cost_records():
+    """
+    Stream stored cost records as newline-delimited JSON
+    
+    Query params:
+        after_id: Resume after this record id (keyset pagination)
+        limit: Maximum number of records (default: all)
+    """
+    try:
+        after_id = request.args.get("after_id")
+        limit = request.args.get("limit", type=int)
+
+        def generate():
+            for record in db_manager.iter_cost_records(after_id=after_id, limit=limit):
+                yield app.json.dumps(record) + "\n"
+
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+    except Exception as e:
+        logger.error(f"Error in cost records endpoint: {str(e)}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
 @app.route("/api/chat", methods=["POST"])
 def chat():
     """
@@ -10,19 +10,22 @@ from flask_cors import CORS
 from dotenv import load_dotenv
 from finops_chatbot import FinOpsChatbot
 from mistral_ai_engine import MistralAIEngine
+from json_provider import init_json_provider
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
+# Configure logging; force replaces any handler a library module installed at import
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    force=True
 )
 logger = logging.getLogger(__name__)
 
 # Initialize Flask app
 app = Flask(__name__, template_folder='templates')
+init_json_provider(app)
 CORS(app)
 
 # Initialize components
@@ -4,34 +4,120 @@ Handles extraction of AWS usage and cost data from AWS Cost Explorer API
 """
 
 import boto3
+import copy
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Dict, Any, Hashable, Optional, Tuple
 import logging
+from botocore.config import Config
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DEFAULT_METRICS = ["BlendedCost", "UsageQuantity"]
+DEFAULT_GROUP_BY = ["SERVICE", "REGION"]
+
+# Parts of the Cost Explorer request that never change between calls
+PURCHASE_TYPE_FILTER = {
+    "Dimensions": {
+        "Key": "PURCHASE_TYPE",
+        "Values": ["On Demand", "Reserved"],
+    }
+}
+
+_TAG_PAIR = itemgetter("Key", "Value")
+
+# Largest page sizes the EC2 API accepts, to keep full scans to few round-trips
+INSTANCE_PAGE_SIZE = 1000
+VOLUME_PAGE_SIZE = 500
+
+# Large enough for the concurrent lookups plus Flask threads sharing one client
+CLIENT_CONFIG = Config(max_pool_connections=50, retries={"mode": "adaptive"})
+
+_session = boto3.session.Session()
+_session_lock = threading.Lock()
+
+
+@lru_cache(maxsize=16)
+def _group_by_param(dimensions: Tuple[str, ...]) -> List[Dict[str, str]]:
+    """Build (once per dimension set) the GroupBy list for Cost Explorer"""
+    return [{"Type": "DIMENSION", "Key": key} for key in dimensions]
+
+
+@lru_cache(maxsize=8)
+def get_aws_client(service: str, region: str):
+    """
+    Get a shared boto3 client for a service and region
+    
+    Clients are thread-safe, so one instance (and its connection pool) is
+    reused by every extractor instead of being rebuilt per instance.
+    
+    Args:
+        service: AWS service name, e.g. "ce" or "ec2"
+        region: AWS region
+    
+    Returns:
+        boto3 client
+    """
+    # Sessions are not thread-safe; serialize client creation
+    with _session_lock:
+        return _session.client(service, region_name=region, config=CLIENT_CONFIG)
+
 
 class AWSCostExtractor:
     """Extract AWS cost and usage data from AWS Cost Explorer API"""
 
-    def __init__(self, region: str = "us-east-1"):
+    def __init__(self, region: str = "us-east-1", cache_ttl: int = 300):
         """
         Initialize AWS Cost Explorer client
         
         Args:
             region: AWS region for the client
+            cache_ttl: Seconds to reuse API responses (0 disables caching)
         """
-        self.ce_client = boto3.client("ce", region_name=region)
-        self.ec2_client = boto3.client("ec2", region_name=region)
+        self.ce_client = get_aws_client("ce", region)
+        self.ec2_client = get_aws_client("ec2", region)
+        self.cache_ttl = cache_ttl
+        self._cache: Dict[Hashable, Any] = {}
+        self._cache_lock = threading.Lock()
         logger.info("AWS Cost Explorer client initialized")
 
+    def _cache_get(self, key: Hashable) -> Optional[Any]:
+        """Return a copy of a cached value if it has not expired, so callers cannot alter the cache"""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._cache[key]
+                return None
+        return copy.deepcopy(value)
+
+    def _cache_set(self, key: Hashable, value: Any) -> None:
+        """Cache a copy of a successful API result for cache_ttl seconds"""
+        if self.cache_ttl <= 0:
+            return
+        # Copied so later changes to the caller's object do not leak into the cache
+        value = copy.deepcopy(value)
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + self.cache_ttl, value)
+
+    def clear_cache(self) -> None:
+        """Drop all cached API responses"""
+        with self._cache_lock:
+            self._cache.clear()
+
     def get_cost_and_usage(
         self,
         days: int = 30,
         granularity: str = "DAILY",
-        metrics: List[str] = None
+        metrics: List[str] = None,
+        group_by: List[str] = None
     ) -> Dict[str, Any]:
         """
         Retrieve cost and usage data from AWS Cost Explorer
@@ -40,75 +126,100 @@ class AWSCostExtractor:
             days: Number of days to retrieve data for
             granularity: DAILY, MONTHLY, or HOURLY
             metrics: List of metrics to retrieve (default: BlendedCost, UsageQuantity)
+            group_by: Cost Explorer dimensions to group by (default: SERVICE, REGION)
         
         Returns:
             Dictionary containing cost and usage data
         """
-        if metrics is None:
-            metrics = ["BlendedCost", "UsageQuantity"]
+        metrics = tuple(metrics or DEFAULT_METRICS)
+        group_by = tuple(group_by or DEFAULT_GROUP_BY)
 
         end_date = datetime.now().date()
         start_date = end_date - timedelta(days=days)
 
+        # Cost Explorer bills per request; reuse identical queries within the TTL
+        cache_key = ("cost_and_usage", start_date, end_date, granularity, metrics, group_by)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
+        params = {
+            "TimePeriod": {"Start": start_date.isoformat(), "End": end_date.isoformat()},
+            "Granularity": granularity,
+            "Metrics": list(metrics),
+            "GroupBy": _group_by_param(group_by),
+            "Filter": PURCHASE_TYPE_FILTER,
+        }
+
         try:
-            response = self.ce_client.get_cost_and_usage(
-                TimePeriod={
-                    "Start": start_date.strftime("%Y-%m-%d"),
-                    "End": end_date.strftime("%Y-%m-%d"),
-                },
-                Granularity=granularity,
-                Metrics=metrics,
-                GroupBy=[
-                    {"Type": "DIMENSION", "Key": "SERVICE"},
-                    {"Type": "DIMENSION", "Key": "REGION"},
-                ],
-                Filter={
-                    "Dimensions": {
-                        "Key": "PURCHASE_TYPE",
-                        "Values": ["On Demand", "Reserved"],
-                    }
-                },
-            )
-            logger.info(f"Successfully retrieved cost data for {days} days")
+            # Cost Explorer has no boto3 paginator; follow NextPageToken manually
+            # and merge every page into the first response
+            response = self.ce_client.get_cost_and_usage(**params)
+            results_by_time = response.setdefault("ResultsByTime", [])
+            dimension_attributes = response.setdefault("DimensionValueAttributes", [])
+            next_token = response.pop("NextPageToken", None)
+            pages = 1
+
+            while next_token:
+                page = self.ce_client.get_cost_and_usage(**params, NextPageToken=next_token)
+                results_by_time.extend(page.get("ResultsByTime", []))
+                dimension_attributes.extend(page.get("DimensionValueAttributes", []))
+                next_token = page.get("NextPageToken")
+                pages += 1
+
+            logger.info("Successfully retrieved cost data for %s days (%s pages)", days, pages)
+            self._cache_set(cache_key, response)
             return response
         except Exception as e:
-            logger.error(f"Error retrieving cost data: {str(e)}")
+            logger.error("Error retrieving cost data: %s", e)
             raise
 
-    def get_service_breakdown(self, days: int = 30) -> List[Dict[str, Any]]:
+    def _get_breakdown_groups(
+        self,
+        days: int,
+        group_by: Optional[List[str]],
+        include_usage: bool,
+    ) -> Tuple[List[str], List[Tuple[Dict[str, Any], str]]]:
+        """Fetch Cost Explorer groups with only the metrics the breakdown needs"""
+        group_by = group_by or DEFAULT_GROUP_BY
+        metrics = ["BlendedCost", "UsageQuantity"] if include_usage else ["BlendedCost"]
+        response = self.get_cost_and_usage(days=days, metrics=metrics, group_by=group_by)
+        groups = [
+            (group, result.get("TimePeriod", {}).get("Start"))
+            for result in response.get("ResultsByTime", [])
+            for group in result.get("Groups", [])
+        ]
+        return [key.lower() for key in group_by], groups
+
+    def get_service_breakdown(
+        self,
+        days: int = 30,
+        group_by: List[str] = None,
+        include_usage: bool = True
+    ) -> List[Dict[str, Any]]:
         """
         Get cost breakdown by AWS service
         
         Args:
             days: Number of days to analyze
+            group_by: Cost Explorer dimensions to group by (default: SERVICE, REGION)
+            include_usage: Also request UsageQuantity and return a usage field
         
         Returns:
             List of dictionaries with service costs
         """
-        response = self.get_cost_and_usage(days=days)
+        key_columns, groups = self._get_breakdown_groups(days, group_by, include_usage)
         service_costs = []
 
-        for result in response.get("ResultsByTime", []):
-            for group in result.get("Groups", []):
-                service_name = None
-                region = None
-
-                for key in group.get("Keys", []):
-                    if key.startswith("Amazon"):
-                        service_name = key
-                    else:
-                        region = key
-
-                metrics = group.get("Metrics", {})
-                service_costs.append(
-                    {
-                        "service": service_name,
-                        "region": region,
-                        "cost": float(metrics.get("BlendedCost", {}).get("Amount", 0)),
-                        "usage": float(metrics.get("UsageQuantity", {}).get("Amount", 0)),
-                        "date": result.get("TimePeriod", {}).get("Start"),
-                    }
-                )
+        for group, date in groups:
+            # Keys come back in GroupBy order
+            record = dict(zip(key_columns, group["Keys"]))
+            metrics = group.get("Metrics", {})
+            record["cost"] = float(metrics.get("BlendedCost", {}).get("Amount", 0))
+            if include_usage:
+                record["usage"] = float(metrics.get("UsageQuantity", {}).get("Amount", 0))
+            record["date"] = date
+            service_costs.append(record)
 
         return service_costs
 
@@ -119,32 +230,35 @@ class AWSCostExtractor:
         Returns:
             List of EC2 instance information
         """
+        cached = self._cache_get(("ec2_instances",))
+        if cached is not None:
+            return cached
+
         instances = []
         try:
-            response = self.ec2_client.describe_instances()
+            paginator = self.ec2_client.get_paginator("describe_instances")
+            pages = paginator.paginate(PaginationConfig={"PageSize": INSTANCE_PAGE_SIZE})
 
-            for reservation in response.get("Reservations", []):
+            for reservation in (r for page in pages for r in page.get("Reservations", [])):
                 for instance in reservation.get("Instances", []):
+                    get = instance.get
+                    launch_time = get("LaunchTime")
                     instances.append(
                         {
-                            "instance_id": instance.get("InstanceId"),
-                            "instance_type": instance.get("InstanceType"),
-                            "state": instance.get("State", {}).get("Name"),
-                            "launch_time": instance.get("LaunchTime").isoformat()
-                            if instance.get("LaunchTime")
-                            else None,
-                            "region": instance.get("Placement", {}).get("AvailabilityZone"),
-                            "tags": {
-                                tag["Key"]: tag["Value"]
-                                for tag in instance.get("Tags", [])
-                            },
+                            "instance_id": get("InstanceId"),
+                            "instance_type": get("InstanceType"),
+                            "state": get("State", {}).get("Name"),
+                            "launch_time": launch_time.isoformat() if launch_time else None,
+                            "region": get("Placement", {}).get("AvailabilityZone"),
+                            "tags": dict(map(_TAG_PAIR, get("Tags") or ())),
                         }
                     )
 
-            logger.info(f"Retrieved {len(instances)} EC2 instances")
+            logger.info("Retrieved %s EC2 instances", len(instances))
+            self._cache_set(("ec2_instances",), instances)
             return instances
         except Exception as e:
-            logger.error(f"Error retrieving EC2 instances: {str(e)}")
+            logger.error("Error retrieving EC2 instances: %s", e)
             return []
 
     def get_unused_resources(self) -> Dict[str, Any]:
@@ -154,47 +268,95 @@ class AWSCostExtractor:
         Returns:
             Dictionary containing unused resources information
         """
+        cached = self._cache_get(("unused_resources",))
+        if cached is not None:
+            return cached
+
         unused_resources = {
             "stopped_instances": [],
             "unattached_volumes": [],
             "unused_elastic_ips": [],
         }
 
-        try:
-            # Get stopped instances
-            response = self.ec2_client.describe_instances(
-                Filters=[{"Name": "instance-state-name", "Values": ["stopped"]}]
-            )
+        # The three lookups are independent API calls; run them concurrently
+        # so the wall time is the slowest call rather than their sum
+        fetchers = {
+            "stopped_instances": self._get_stopped_instances,
+            "unattached_volumes": self._get_unattached_volumes,
+            "unused_elastic_ips": self._get_unused_elastic_ips,
+        }
+        complete = True
+        with ThreadPoolExecutor(max_workers=len(fetchers)) as executor:
+            futures = {key: executor.submit(fetch) for key, fetch in fetchers.items()}
+            for key, future in futures.items():
+                try:
+                    unused_resources[key] = future.result()
+                except Exception as e:
+                    logger.error("Error identifying unused resources (%s): %s", key, e)
+                    complete = False
 
-            for reservation in response.get("Reservations", []):
-                for instance in reservation.get("Instances", []):
-                    unused_resources["stopped_instances"].append(
-                        {
-                            "instance_id": instance.get("InstanceId"),
-                            "instance_type": instance.get("InstanceType"),
-                            "stopped_since": instance.get("StateTransitionReason"),
-                        }
-                    )
+        if complete:
+            logger.info("Successfully identified unused resources")
+            self._cache_set(("unused_resources",), unused_resources)
+        return unused_resources
 
-            # Get unattached volumes
-            response = self.ec2_client.describe_volumes(
-                Filters=[{"Name": "status", "Values": ["available"]}]
-            )
+    def _get_stopped_instances(self) -> List[Dict[str, Any]]:
+        """Get stopped EC2 instances"""
+        stopped_instances = []
+        pages = self.ec2_client.get_paginator("describe_instances").paginate(
+            Filters=[{"Name": "instance-state-name", "Values": ["stopped"]}],
+            PaginationConfig={"PageSize": INSTANCE_PAGE_SIZE},
+        )
 
-            for volume in response.get("Volumes", []):
-                unused_resources["unattached_volumes"].append(
+        for reservation in (r for page in pages for r in page.get("Reservations", [])):
+            for instance in reservation.get("Instances", []):
+                stopped_instances.append(
                     {
-                        "volume_id": volume.get("VolumeId"),
-                        "size": volume.get("Size"),
-                        "region": volume.get("AvailabilityZone"),
+                        "instance_id": instance.get("InstanceId"),
+                        "instance_type": instance.get("InstanceType"),
+                        "stopped_since": instance.get("StateTransitionReason"),
                     }
                 )
 
-            logger.info("Successfully identified unused resources")
-            return unused_resources
-        except Exception as e:
-            logger.error(f"Error identifying unused resources: {str(e)}")
-            return unused_resources
+        return stopped_instances
+
+    def _get_unattached_volumes(self) -> List[Dict[str, Any]]:
+        """Get EBS volumes not attached to any instance"""
+        unattached_volumes = []
+        pages = self.ec2_client.get_paginator("describe_volumes").paginate(
+            Filters=[{"Name": "status", "Values": ["available"]}],
+            PaginationConfig={"PageSize": VOLUME_PAGE_SIZE},
+        )
+
+        for volume in (v for page in pages for v in page.get("Volumes", [])):
+            unattached_volumes.append(
+                {
+                    "volume_id": volume.get("VolumeId"),
+                    "size": volume.get("Size"),
+                    "region": volume.get("AvailabilityZone"),
+                }
+            )
+
+        return unattached_volumes
+
+    def _get_unused_elastic_ips(self) -> List[Dict[str, Any]]:
+        """Get Elastic IPs not associated with any instance or interface"""
+        unused_elastic_ips = []
+        # DescribeAddresses is not paginated; one call returns every address
+        response = self.ec2_client.describe_addresses()
+
+        for address in response.get("Addresses", []):
+            if address.get("AssociationId"):
+                continue
+            unused_elastic_ips.append(
+                {
+                    "allocation_id": address.get("AllocationId"),
+                    "public_ip": address.get("PublicIp"),
+                    "domain": address.get("Domain"),
+                }
+            )
+
+        return unused_elastic_ips
 
     def generate_optimization_data(self, days: int = 30) -> Dict[str, Any]:
         """
@@ -206,9 +368,15 @@ class AWSCostExtractor:
         Returns:
             Dictionary with all optimization-relevant data
         """
-        return {
-            "service_breakdown": self.get_service_breakdown(days),
-            "ec2_instances": self.get_ec2_instances(),
-            "unused_resources": self.get_unused_resources(),
-            "timestamp": datetime.now().isoformat(),
-        }
+        # Cost Explorer and the EC2 describes are independent network calls
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            service_breakdown = executor.submit(self.get_service_breakdown, days)
+            ec2_instances = executor.submit(self.get_ec2_instances)
+            unused_resources = executor.submit(self.get_unused_resources)
+
+            return {
+                "service_breakdown": service_breakdown.result(),
+                "ec2_instances": ec2_instances.result(),
+                "unused_resources": unused_resources.result(),
+                "timestamp": datetime.now().isoformat(),
+            }
@@ -3,14 +3,14 @@ import json
 from datetime import datetime, timedelta
 from typing import List,Dict,Any
 import logging
+from aws_cost_extractor import get_aws_client
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class awsExtractor:
   def __init__(self,region:str="us-east-1"):
-        self.ce_client = boto3.client("ce", region_name=region)
-        self.ec2_client=boto3.client("ec2",region_name=region)
+        self.ce_client = get_aws_client("ce", region)
+        self.ec2_client=get_aws_client("ec2",region)
         logger.info("AWS Cost Extractor Initialized")
     
 
@@ -19,29 +19,38 @@ class awsExtractor:
           metrics = ["BlendedCost", "UsageQuantity"]
       endDate = datetime.now().date()
       startdate = endDate - timedelta(days=days)
-      try:
-          response = self.ce_client.get_cost_and_usage(
-              TimePeriod={
-                  'Start': startdate.strftime("%Y-%m-%d"),
-                  'End': endDate.strftime("%Y-%m-%d")
-              },
-              Granularity=granularity,
-              Metrics=metrics,
-              GroupBy=[
-                  {"Type": "DIMENSION", "Key": "SERVICE"},
-                  {"Type": "DIMENSION", "Key": "REGION"}
-              ],
-              Filter={
-                  "Dimensions": {
-                      "Key": "PURCHASE_TYPE",
-                      "Values": ["On Demand", "Reserved"]
-                  }
+      params = {
+          'TimePeriod': {
+              'Start': startdate.strftime("%Y-%m-%d"),
+              'End': endDate.strftime("%Y-%m-%d")
+          },
+          'Granularity': granularity,
+          'Metrics': metrics,
+          'GroupBy': [
+              {"Type": "DIMENSION", "Key": "SERVICE"},
+              {"Type": "DIMENSION", "Key": "REGION"}
+          ],
+          'Filter': {
+              "Dimensions": {
+                  "Key": "PURCHASE_TYPE",
+                  "Values": ["On Demand", "Reserved"]
               }
-          )
+          }
+      }
+      try:
+          response = self.ce_client.get_cost_and_usage(**params)
+          results_by_time = response.setdefault("ResultsByTime", [])
+          dimension_attributes = response.setdefault("DimensionValueAttributes", [])
+          next_token = response.pop("NextPageToken", None)
+          while next_token:
+              page = self.ce_client.get_cost_and_usage(**params, NextPageToken=next_token)
+              results_by_time.extend(page.get("ResultsByTime", []))
+              dimension_attributes.extend(page.get("DimensionValueAttributes", []))
+              next_token = page.get("NextPageToken")
           logger.info("Cost and Usage Data Extracted")
           return response
       except Exception as e:
-          logger.info(f"Error retrieving cost data: {str(e)}")
+          logger.error("Error retrieving cost data: %s", e)
           raise
       
   def get_services_breakdown(self,days:int =30)-> List[Dict[str, Any]]:
@@ -49,36 +58,22 @@ class awsExtractor:
       service_costs=[]
 
       for result in response.get("ResultsByTime",[]):
-          for group in result.get("groups",[]):
-              server_name=None
-              region=None
-              for key in group.get("keys",[]):
-                  if key.startwith("Amazone"):
-                    server_name=key
-                  else:
-                    region=key
-
-            
+          for group in result.get("Groups",[]):
+              # Keys follow the GroupBy order: [SERVICE, REGION]
+              server_name,region=group["Keys"]
               metrics=group.get("Metrics",{})
               service_costs.append({
                  "service":server_name,
                  "region":region,
                  "cost":float(metrics.get("BlendedCost",{}).get("Amount",0)),
-                 
-                 
-           
-
-
-
-
-
+                 "usage":float(metrics.get("UsageQuantity",{}).get("Amount",0)),
+                 "date":result.get("TimePeriod",{}).get("Start"),
               })
+      return service_costs
 
 
-
-         
-           
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     ce = awsExtractor()
     cost_and_usage = ce.get_cost_and_uage(days=30, granularity="DAILY", metrics=None)
     print(cost_and_usage)
@@ -4,44 +4,408 @@ Handles storage and retrieval of AWS cost data using ChromaDB for efficient simi
 """
 
 import chromadb
+from chromadb.config import Settings
 import json
 import logging
-from typing import List, Dict, Any, Optional
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Union
 from datetime import datetime
+from functools import lru_cache
 import hashlib
 
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Same model as ChromaDB's default embedding function, so vectors stay
+# comparable with anything embedded by Chroma itself
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+EMBEDDING_BATCH_SIZE = 256
+
+# Documents embedded per chunk while the previous chunk is being written
+EMBED_CHUNK_SIZE = 4 * EMBEDDING_BATCH_SIZE
+
+# Searches read only metadata, so document texts are neither stored (when
+# embedded here) nor fetched by queries
+QUERY_INCLUDE = ["metadatas", "distances"]
+
+# All record kinds share one collection (and one HNSW index); queries filter
+# on the "kind" metadata field
+COLLECTION_NAME = "finops"
+KIND_COST = "cost"
+KIND_RESOURCE = "resource"
+KIND_INSIGHT = "insight"
+
+# Rows per collection.add() call; the same BATCH_SIZE setting as config.Config,
+# kept within the 50-250 range where Chroma's inserts are fastest
+ADD_BATCH_SIZE = max(50, min(250, int(os.getenv("BATCH_SIZE", 100))))
+
+# Ids per collection.get() or delete() call by id, well under
+# SQLite's bound-parameter limit
+ID_BATCH_SIZE = 1000
+
+# Formatted search results are reused for CACHE_TTL seconds (the config.Config
+# setting) or until the stored data changes
+SEARCH_CACHE_TTL = int(os.getenv("CACHE_TTL", 3600))
+SEARCH_CACHE_SIZE = 1024
+
+# Single writer thread, so upserts overlap with embedding but never with each other
+_writer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chroma-writer")
+
+
+@lru_cache(maxsize=4)
+def _get_client(persist_directory: str):
+    """
+    Get the process-wide persistent ChromaDB client for a directory
+    
+    Every store using the same directory shares one client, so the on-disk
+    index is opened once rather than per ChromaDBStore.
+    
+    Args:
+        persist_directory: Path to persist ChromaDB data
+    
+    Returns:
+        ChromaDB client
+    """
+    return chromadb.PersistentClient(
+        path=persist_directory,
+        settings=Settings(anonymized_telemetry=False)
+    )
+
 
 class ChromaDBStore:
     """Manage AWS cost data storage and retrieval using ChromaDB"""
 
-    def __init__(self, persist_directory: str = "./data/chromadb"):
+    def __init__(self, persist_directory: str = "./data/chromadb", cache_ttl: int = SEARCH_CACHE_TTL):
         """
         Initialize ChromaDB client
         
         Args:
-            persist_directory: Path to persist ChromaDB data
+            persist_directory: Path to persist ChromaDB data (collections
+                survive restarts and are not re-ingested)
+            cache_ttl: Seconds to reuse search results (0 disables caching)
         """
         self.persist_directory = persist_directory
-        self.client = chromadb.Client()
+        self.client = _get_client(persist_directory)
         
-        # Create or get collections
-        self.cost_collection = self.client.get_or_create_collection(
-            name="aws_costs",
-            metadata={"hnsw:space": "cosine"}
-        )
-        self.optimization_collection = self.client.get_or_create_collection(
-            name="optimization_insights",
+        # Create or get the collection
+        self.collection = self._open_collection()
+
+        # Search results keyed by (search, query, limits); _data_version is
+        # bumped on every write so results computed before it are not cached
+        self.cache_ttl = cache_ttl
+        self._search_cache: Dict[Tuple[Any, ...], Tuple[float, Any]] = {}
+        self._search_cache_lock = threading.Lock()
+        self._data_version = 0
+
+        # Documents are embedded here in large batches and handed to Chroma,
+        # instead of leaving it to embed inside every add()/query() call
+        self.embedder = None
+        if SENTENCE_TRANSFORMERS_AVAILABLE:
+            device = "cuda" if TORCH_AVAILABLE and torch.cuda.is_available() else "cpu"
+            try:
+                self.embedder = SentenceTransformer(EMBEDDING_MODEL, device=device)
+                logger.info(f"Embedding model {EMBEDDING_MODEL} loaded on {device}")
+            except Exception as e:
+                logger.warning(f"Embedding model unavailable, using ChromaDB's embedding function: {str(e)}")
+        
+        logger.info(f"ChromaDB initialized with persist directory: {persist_directory}")
+
+    def _open_collection(self):
+        """Get or create the shared collection"""
+        return self.client.get_or_create_collection(
+            name=COLLECTION_NAME,
             metadata={"hnsw:space": "cosine"}
         )
-        self.resource_collection = self.client.get_or_create_collection(
-            name="aws_resources",
-            metadata={"hnsw:space": "cosine"}
+
+    def _embed(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """
+        Embed texts in batches with the shared model
+        
+        Args:
+            texts: Documents or queries to embed
+        
+        Returns:
+            List of embeddings, or None to let ChromaDB embed the texts itself
+        """
+        if self.embedder is None:
+            return None
+        embeddings = self.embedder.encode(
+            texts,
+            batch_size=EMBEDDING_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
         )
+        return embeddings.tolist()
+
+    @staticmethod
+    def _stored_fingerprints(collection, ids: List[str]) -> Dict[str, str]:
+        """
+        Fingerprints of the given records as currently stored in the collection
         
-        logger.info(f"ChromaDB initialized with persist directory: {persist_directory}")
+        Read from Chroma on every write rather than remembered, since another
+        process or store may have cleared or rewritten the persist directory.
+        
+        Args:
+            collection: ChromaDB collection to read
+            ids: Prefixed record ids
+        
+        Returns:
+            Mapping of prefixed record id to content fingerprint, for stored ids only
+        """
+        fingerprints = {}
+        for start in range(0, len(ids), ID_BATCH_SIZE):
+            stored = collection.get(
+                ids=ids[start:start + ID_BATCH_SIZE], include=["metadatas"]
+            )
+            fingerprints.update(
+                (doc_id, metadata.get("fingerprint", ""))
+                for doc_id, metadata in zip(stored["ids"], stored["metadatas"] or [])
+            )
+        return fingerprints
+
+    def _add_in_batches(self, kind: str, documents: List[str], metadatas: List[Dict[str, Any]],
+                        ids: List[str], batch_size: int = ADD_BATCH_SIZE) -> None:
+        """
+        Embed and upsert documents of one kind into the collection in fixed-size batches
+        
+        Records already stored with identical content are skipped before
+        embedding, so re-syncing unchanged data costs no embedding or writes.
+        
+        Args:
+            kind: Record kind (KIND_COST, KIND_RESOURCE or KIND_INSIGHT)
+            documents: Document texts
+            metadatas: Metadata per document
+            ids: ID per document
+            batch_size: Rows per upsert() call
+        """
+        # Re-resolve the collection, since another store may have dropped and
+        # recreated it since this one opened it
+        collection = self.collection = self._open_collection()
+
+        # Prefix ids with the kind so records of different kinds can never overwrite
+        # each other. Chroma rejects repeated ids in one upsert, so the last record
+        # with a given id wins
+        records = {
+            f"{kind}:{doc_id}": (document, metadata)
+            for document, metadata, doc_id in zip(documents, metadatas, ids)
+        }
+        stored = self._stored_fingerprints(collection, list(records))
+
+        new_documents, new_metadatas, new_ids = [], [], []
+        for doc_id, (document, metadata) in records.items():
+            metadata["kind"] = kind
+            fingerprint = hashlib.md5(
+                f"{document}\n{json.dumps(metadata, sort_keys=True)}".encode()
+            ).hexdigest()
+            if stored.get(doc_id) == fingerprint:
+                continue
+            metadata["fingerprint"] = fingerprint
+            new_documents.append(document)
+            new_metadatas.append(metadata)
+            new_ids.append(doc_id)
+
+        if len(new_ids) < len(ids):
+            logger.info(f"Skipped {len(ids) - len(new_ids)} unchanged {kind} records")
+        if not new_ids:
+            return
+
+        # Embed the next chunk while the previous one is written on the writer
+        # thread; model inference and SQLite writes both release the GIL
+        pending = None
+        try:
+            for start in range(0, len(new_documents), EMBED_CHUNK_SIZE):
+                end = start + EMBED_CHUNK_SIZE
+                embeddings = self._embed(new_documents[start:end])
+                if pending is not None:
+                    pending.result()
+                pending = _writer_pool.submit(
+                    self._upsert_in_batches, collection, embeddings,
+                    new_documents[start:end], new_metadatas[start:end], new_ids[start:end], batch_size
+                )
+        finally:
+            if pending is not None:
+                pending.result()
+            self._invalidate_searches()
+
+    def _remove_stale(self, kind: str, current_ids: List[str],
+                      date_range: Optional[Tuple[str, str]] = None) -> None:
+        """
+        Delete stored records of one kind that are missing from the latest sync
+        
+        Writes only upsert, so without this terminated instances and outdated
+        insights would stay in the persistent collection indefinitely.
+        
+        Args:
+            kind: Record kind (KIND_COST, KIND_RESOURCE or KIND_INSIGHT)
+            current_ids: Unprefixed ids of every record in the latest sync
+            date_range: Only replace records whose date falls in this inclusive
+                (first, last) range, so older history outside a sync window is kept
+        """
+        collection = self.collection
+        current = {f"{kind}:{doc_id}" for doc_id in current_ids}
+        if date_range is None:
+            stored = collection.get(where={"kind": kind}, include=[])
+            stored_ids = stored["ids"]
+        else:
+            # ISO dates order as strings, and Chroma only range-filters numbers
+            first, last = date_range
+            stored = collection.get(where={"kind": kind}, include=["metadatas"])
+            stored_ids = [
+                doc_id for doc_id, metadata in zip(stored["ids"], stored["metadatas"] or [])
+                if first <= str(metadata.get("date", "")) <= last
+            ]
+
+        stale = [doc_id for doc_id in stored_ids if doc_id not in current]
+        if not stale:
+            return
+        for start in range(0, len(stale), ID_BATCH_SIZE):
+            collection.delete(ids=stale[start:start + ID_BATCH_SIZE])
+        self._invalidate_searches()
+        logger.info(f"Removed {len(stale)} stale {kind} records")
+
+    @staticmethod
+    def _upsert_in_batches(collection, embeddings: Optional[List[List[float]]],
+                           documents: List[str], metadatas: List[Dict[str, Any]], ids: List[str],
+                           batch_size: int) -> None:
+        """
+        Upsert embedded records in fixed-size batches
+        
+        Args:
+            collection: Target ChromaDB collection
+            embeddings: Embedding per document, or None to let ChromaDB embed
+            documents: Document texts, stored only when ChromaDB embeds them
+            metadatas: Metadata per document, including its fingerprint
+            ids: Prefixed ID per document
+            batch_size: Rows per upsert() call
+        """
+        for start in range(0, len(documents), batch_size):
+            end = start + batch_size
+            # Upsert: the collections persist, so re-synced records replace their old rows.
+            # Texts are only needed when ChromaDB embeds them itself
+            collection.upsert(
+                embeddings=embeddings[start:end] if embeddings is not None else None,
+                documents=documents[start:end] if embeddings is None else None,
+                metadatas=metadatas[start:end],
+                ids=ids[start:end]
+            )
+
+    @staticmethod
+    def _copy_results(results: Any) -> Any:
+        """Copy a list of result dicts, or a tuple of such lists, so callers cannot alter the cache"""
+        if isinstance(results, tuple):
+            return tuple([dict(r) for r in part] for part in results)
+        return [dict(r) for r in results]
+
+    def _search_cache_get(self, key: Tuple[Any, ...]) -> Optional[Any]:
+        """Return a copy of cached search results if they have not expired"""
+        with self._search_cache_lock:
+            entry = self._search_cache.get(key)
+            if entry is None:
+                return None
+            expires_at, results = entry
+            if expires_at < time.monotonic():
+                del self._search_cache[key]
+                return None
+        return self._copy_results(results)
+
+    def _search_cache_set(self, key: Tuple[Any, ...], version: int, results: Any) -> None:
+        """
+        Cache search results for cache_ttl seconds
+        
+        Args:
+            key: Cache key
+            version: _data_version read before the search ran
+            results: Formatted search results
+        """
+        if self.cache_ttl <= 0:
+            return
+        with self._search_cache_lock:
+            if version != self._data_version:
+                return
+            if len(self._search_cache) >= SEARCH_CACHE_SIZE:
+                # Evict the oldest entry
+                del self._search_cache[next(iter(self._search_cache))]
+            self._search_cache[key] = (time.monotonic() + self.cache_ttl, self._copy_results(results))
+
+    def _invalidate_searches(self) -> None:
+        """Drop cached search results after the stored data changed"""
+        with self._search_cache_lock:
+            self._data_version += 1
+            self._search_cache.clear()
+
+    def _query_args(self, query: str) -> Dict[str, Any]:
+        """Build the query arguments, embedding the query with the same model as the documents"""
+        embeddings = self._embed([query])
+        if embeddings is None:
+            return {"query_texts": [query]}
+        return {"query_embeddings": embeddings}
+
+    def batch_query(self, queries: List[str], kinds: List[str],
+                    n_results: Union[int, Sequence[int]] = 5) -> List[Dict[str, Any]]:
+        """
+        Run several queries, each against one record kind, with a single embedding pass
+        
+        ChromaDB applies a where filter to every query in a call, so queries are
+        grouped by kind and result count: one collection.query() per group,
+        carrying all of that group's query embeddings.
+        
+        Args:
+            queries: Natural language queries
+            kinds: Record kind to search per query (KIND_COST, KIND_RESOURCE or KIND_INSIGHT)
+            n_results: Number of results per query, or one count per query
+        
+        Returns:
+            Query results per query, in input order, shaped like query_costs() output
+        """
+        counts = [n_results] * len(queries) if isinstance(n_results, int) else list(n_results)
+        empty = {"documents": [], "metadatas": [], "distances": []}
+        results: List[Dict[str, Any]] = [empty] * len(queries)
+
+        try:
+            # Embed each distinct query once, however many kinds it is run against
+            unique = list(dict.fromkeys(queries))
+            embeddings = self._embed(unique)
+            embedding_for = dict(zip(unique, embeddings)) if embeddings is not None else None
+
+            groups: Dict[Tuple[str, int], List[int]] = {}
+            for i, key in enumerate(zip(kinds, counts)):
+                groups.setdefault(key, []).append(i)
+
+            for (kind, count), positions in groups.items():
+                group_queries = [queries[i] for i in positions]
+                if embedding_for is None:
+                    query_args = {"query_texts": group_queries}
+                else:
+                    query_args = {"query_embeddings": [embedding_for[q] for q in group_queries]}
+                group_results = self.collection.query(
+                    n_results=count, where={"kind": kind}, include=QUERY_INCLUDE, **query_args
+                )
+
+                # Split the per-query lists back out into single-query results
+                for j, i in enumerate(positions):
+                    results[i] = {
+                        key: value[j:j + 1] if isinstance(value, list) and len(value) == len(positions) else value
+                        for key, value in group_results.items()
+                    }
+        except Exception as e:
+            logger.error(f"Error running batch query: {str(e)}")
+
+        return results
 
     def add_cost_data(self, cost_data: List[Dict[str, Any]]) -> None:
         """
@@ -61,34 +425,36 @@ class ChromaDBStore:
             ids = []
 
             for idx, data in enumerate(cost_data):
+                # Keyed on content, so re-syncing an overlapping window
+                # replaces each day's row instead of adding another
                 doc_id = hashlib.md5(
-                    f"{data.get('service')}{data.get('date')}{idx}".encode()
+                    f"{data.get('service')}|{data.get('region')}|{data.get('date')}".encode()
                 ).hexdigest()
 
-                document = f"""
-                Service: {data.get('service', 'Unknown')}
-                Region: {data.get('region', 'Unknown')}
-                Cost: ${data.get('cost', 0):.2f}
-                Usage: {data.get('usage', 0)}
-                Date: {data.get('date', 'Unknown')}
-                """
+                document = (
+                    f"Service: {data.get('service', 'Unknown')}\n"
+                    f"Region: {data.get('region', 'Unknown')}\n"
+                    f"Cost: ${data.get('cost', 0):.2f}\n"
+                    f"Usage: {data.get('usage', 0)}\n"
+                    f"Date: {data.get('date', 'Unknown')}"
+                )
 
                 documents.append(document)
                 metadatas.append(
                     {
                         "service": data.get("service", ""),
                         "region": data.get("region", ""),
-                        "cost": str(data.get("cost", 0)),
+                        "cost": float(data.get("cost", 0)),
                         "date": data.get("date", ""),
                     }
                 )
                 ids.append(doc_id)
 
-            self.cost_collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
-            )
+            self._add_in_batches(KIND_COST, documents, metadatas, ids)
+            # A sync covers a window of days; replace the rows for those days only
+            dates = [str(m["date"]) for m in metadatas if m["date"]]
+            if dates:
+                self._remove_stale(KIND_COST, ids, date_range=(min(dates), max(dates)))
             logger.info(f"Added {len(cost_data)} cost records to ChromaDB")
         except Exception as e:
             logger.error(f"Error adding cost data to ChromaDB: {str(e)}")
@@ -116,14 +482,14 @@ class ChromaDBStore:
                     f"{resource.get('instance_id', idx)}".encode()
                 ).hexdigest()
 
-                document = f"""
-                Instance ID: {resource.get('instance_id', 'Unknown')}
-                Instance Type: {resource.get('instance_type', 'Unknown')}
-                State: {resource.get('state', 'Unknown')}
-                Region: {resource.get('region', 'Unknown')}
-                Launch Time: {resource.get('launch_time', 'Unknown')}
-                Tags: {json.dumps(resource.get('tags', {}))}
-                """
+                document = (
+                    f"Instance ID: {resource.get('instance_id', 'Unknown')}\n"
+                    f"Instance Type: {resource.get('instance_type', 'Unknown')}\n"
+                    f"State: {resource.get('state', 'Unknown')}\n"
+                    f"Region: {resource.get('region', 'Unknown')}\n"
+                    f"Launch Time: {resource.get('launch_time', 'Unknown')}\n"
+                    f"Tags: {json.dumps(resource.get('tags', {}))}"
+                )
 
                 documents.append(document)
                 metadatas.append(
@@ -136,11 +502,9 @@ class ChromaDBStore:
                 )
                 ids.append(doc_id)
 
-            self.resource_collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
-            )
+            self._add_in_batches(KIND_RESOURCE, documents, metadatas, ids)
+            # Each sync lists every instance, so anything missing was terminated
+            self._remove_stale(KIND_RESOURCE, ids)
             logger.info(f"Added {len(resource_data)} resource records to ChromaDB")
         except Exception as e:
             logger.error(f"Error adding resource data to ChromaDB: {str(e)}")
@@ -164,17 +528,19 @@ class ChromaDBStore:
             ids = []
 
             for idx, insight in enumerate(insights):
+                # Keyed on content, so each sync replaces an insight rather than
+                # storing another copy of it
                 doc_id = hashlib.md5(
-                    f"{insight.get('title', idx)}{datetime.now().isoformat()}".encode()
+                    f"{insight.get('title', idx)}|{insight.get('category')}".encode()
                 ).hexdigest()
 
-                document = f"""
-                Title: {insight.get('title', 'Unknown')}
-                Description: {insight.get('description', 'Unknown')}
-                Potential Savings: ${insight.get('potential_savings', 0):.2f}
-                Priority: {insight.get('priority', 'Medium')}
-                Category: {insight.get('category', 'Unknown')}
-                """
+                document = (
+                    f"Title: {insight.get('title', 'Unknown')}\n"
+                    f"Description: {insight.get('description', 'Unknown')}\n"
+                    f"Potential Savings: ${insight.get('potential_savings', 0):.2f}\n"
+                    f"Priority: {insight.get('priority', 'Medium')}\n"
+                    f"Category: {insight.get('category', 'Unknown')}"
+                )
 
                 documents.append(document)
                 metadatas.append(
@@ -182,16 +548,14 @@ class ChromaDBStore:
                         "title": insight.get("title", ""),
                         "priority": insight.get("priority", ""),
                         "category": insight.get("category", ""),
-                        "savings": str(insight.get("potential_savings", 0)),
+                        "savings": float(insight.get("potential_savings", 0)),
                     }
                 )
                 ids.append(doc_id)
 
-            self.optimization_collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
-            )
+            self._add_in_batches(KIND_INSIGHT, documents, metadatas, ids)
+            # Insights are regenerated in full on every sync
+            self._remove_stale(KIND_INSIGHT, ids)
             logger.info(f"Added {len(insights)} optimization insights to ChromaDB")
         except Exception as e:
             logger.error(f"Error adding optimization insights to ChromaDB: {str(e)}")
@@ -209,9 +573,11 @@ class ChromaDBStore:
             Query results with costs and metadata
         """
         try:
-            results = self.cost_collection.query(
-                query_texts=[query],
-                n_results=n_results
+            results = self.collection.query(
+                n_results=n_results,
+                where={"kind": KIND_COST},
+                include=QUERY_INCLUDE,
+                **self._query_args(query)
             )
             return results
         except Exception as e:
@@ -230,9 +596,11 @@ class ChromaDBStore:
             Query results with resources and metadata
         """
         try:
-            results = self.resource_collection.query(
-                query_texts=[query],
-                n_results=n_results
+            results = self.collection.query(
+                n_results=n_results,
+                where={"kind": KIND_RESOURCE},
+                include=QUERY_INCLUDE,
+                **self._query_args(query)
             )
             return results
         except Exception as e:
@@ -251,15 +619,22 @@ class ChromaDBStore:
             Query results with optimization insights
         """
         try:
-            results = self.optimization_collection.query(
-                query_texts=[query],
-                n_results=n_results
+            results = self.collection.query(
+                n_results=n_results,
+                where={"kind": KIND_INSIGHT},
+                include=QUERY_INCLUDE,
+                **self._query_args(query)
             )
             return results
         except Exception as e:
             logger.error(f"Error querying optimizations: {str(e)}")
             return {"documents": [], "metadatas": [], "distances": []}
 
+    def _count(self, kind: str) -> int:
+        """Number of records of one kind currently stored in the collection"""
+        # include=[] returns ids only, without loading metadata or embeddings
+        return len(self.collection.get(where={"kind": kind}, include=[])["ids"])
+
     def get_collection_stats(self) -> Dict[str, Any]:
         """
         Get statistics about stored collections
@@ -268,12 +643,97 @@ class ChromaDBStore:
             Dictionary with collection statistics
         """
         return {
-            "cost_records": self.cost_collection.count(),
-            "resource_records": self.resource_collection.count(),
-            "optimization_records": self.optimization_collection.count(),
+            "cost_records": self._count(KIND_COST),
+            "resource_records": self._count(KIND_RESOURCE),
+            "optimization_records": self._count(KIND_INSIGHT),
             "timestamp": datetime.now().isoformat(),
         }
 
+    @staticmethod
+    def _first_metadatas(results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Metadata of the first (only) query in a query result"""
+        return results["metadatas"][0] if results.get("metadatas") else []
+
+    @classmethod
+    def _format_costs(cls, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Format a cost query result"""
+        return [
+            {
+                "service": m.get("service", ""),
+                "region": m.get("region", ""),
+                "cost": float(m.get("cost", 0)),
+                "date": m.get("date", ""),
+            }
+            for m in cls._first_metadatas(results)
+        ]
+
+    @classmethod
+    def _format_resources(cls, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Format a resource query result"""
+        return [
+            {
+                "instance_id": m.get("instance_id", ""),
+                "instance_type": m.get("instance_type", ""),
+                "state": m.get("state", ""),
+                "region": m.get("region", ""),
+            }
+            for m in cls._first_metadatas(results)
+        ]
+
+    @classmethod
+    def _format_optimizations(cls, results: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Format an optimization insight query result"""
+        return [
+            {
+                "title": m.get("title", ""),
+                "priority": m.get("priority", ""),
+                "category": m.get("category", ""),
+                "savings": float(m.get("savings", 0)),
+            }
+            for m in cls._first_metadatas(results)
+        ]
+
+    def search_all_kinds(self, query: str, cost_limit: int = 10, resource_limit: int = 10,
+                         optimization_limit: int = 5) -> Tuple[List[Dict[str, Any]], ...]:
+        """
+        Search costs, resources and optimization insights for one query
+        
+        The query is embedded once and shared by the three searches.
+        
+        Args:
+            query: Search query
+            cost_limit: Maximum number of cost results
+            resource_limit: Maximum number of resource results
+            optimization_limit: Maximum number of optimization results
+        
+        Returns:
+            Tuple of (cost_data, resource_data, optimization_data)
+        """
+        key = ("all", query, cost_limit, resource_limit, optimization_limit)
+        cached = self._search_cache_get(key)
+        if cached is not None:
+            return cached
+
+        version = self._data_version
+        try:
+            costs, resources, optimizations = self.batch_query(
+                [query] * 3,
+                [KIND_COST, KIND_RESOURCE, KIND_INSIGHT],
+                n_results=[cost_limit, resource_limit, optimization_limit],
+            )
+            results = (
+                self._format_costs(costs),
+                self._format_resources(resources),
+                self._format_optimizations(optimizations),
+            )
+            # Empty results may come from a failed query, so they are not cached
+            if any(results):
+                self._search_cache_set(key, version, results)
+            return results
+        except Exception as e:
+            logger.error(f"Error searching all kinds: {str(e)}")
+            return [], [], []
+
     def search_costs(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """
         Search cost data and return formatted results
@@ -285,18 +745,16 @@ class ChromaDBStore:
         Returns:
             List of cost data dictionaries
         """
+        key = ("costs", query, limit)
+        cached = self._search_cache_get(key)
+        if cached is not None:
+            return cached
+
+        version = self._data_version
         try:
-            results = self.query_costs(query, n_results=limit)
-            formatted_results = []
-            
-            if results.get("metadatas") and len(results["metadatas"]) > 0:
-                for metadata in results["metadatas"][0]:
-                    formatted_results.append({
-                        "service": metadata.get("service", ""),
-                        "region": metadata.get("region", ""),
-                        "cost": float(metadata.get("cost", 0)),
-                        "date": metadata.get("date", ""),
-                    })
+            formatted_results = self._format_costs(self.query_costs(query, n_results=limit))
+            if formatted_results:
+                self._search_cache_set(key, version, formatted_results)
             
             logger.info(f"Search costs returned {len(formatted_results)} results for query: {query}")
             return formatted_results
@@ -315,18 +773,16 @@ class ChromaDBStore:
         Returns:
             List of resource data dictionaries
         """
+        key = ("resources", query, limit)
+        cached = self._search_cache_get(key)
+        if cached is not None:
+            return cached
+
+        version = self._data_version
         try:
-            results = self.query_resources(query, n_results=limit)
-            formatted_results = []
-            
-            if results.get("metadatas") and len(results["metadatas"]) > 0:
-                for metadata in results["metadatas"][0]:
-                    formatted_results.append({
-                        "instance_id": metadata.get("instance_id", ""),
-                        "instance_type": metadata.get("instance_type", ""),
-                        "state": metadata.get("state", ""),
-                        "region": metadata.get("region", ""),
-                    })
+            formatted_results = self._format_resources(self.query_resources(query, n_results=limit))
+            if formatted_results:
+                self._search_cache_set(key, version, formatted_results)
             
             return formatted_results
         except Exception as e:
@@ -344,18 +800,16 @@ class ChromaDBStore:
         Returns:
             List of optimization insight dictionaries
         """
+        key = ("optimizations", query, limit)
+        cached = self._search_cache_get(key)
+        if cached is not None:
+            return cached
+
+        version = self._data_version
         try:
-            results = self.query_optimizations(query, n_results=limit)
-            formatted_results = []
-            
-            if results.get("metadatas") and len(results["metadatas"]) > 0:
-                for metadata in results["metadatas"][0]:
-                    formatted_results.append({
-                        "title": metadata.get("title", ""),
-                        "priority": metadata.get("priority", ""),
-                        "category": metadata.get("category", ""),
-                        "savings": float(metadata.get("savings", 0)),
-                    })
+            formatted_results = self._format_optimizations(self.query_optimizations(query, n_results=limit))
+            if formatted_results:
+                self._search_cache_set(key, version, formatted_results)
             
             return formatted_results
         except Exception as e:
@@ -365,23 +819,11 @@ class ChromaDBStore:
     def clear_collections(self) -> None:
         """Clear all collections"""
         try:
-            self.client.delete_collection(name="aws_costs")
-            self.client.delete_collection(name="optimization_insights")
-            self.client.delete_collection(name="aws_resources")
+            self.client.delete_collection(name=COLLECTION_NAME)
             
-            # Recreate collections
-            self.cost_collection = self.client.get_or_create_collection(
-                name="aws_costs",
-                metadata={"hnsw:space": "cosine"}
-            )
-            self.optimization_collection = self.client.get_or_create_collection(
-                name="optimization_insights",
-                metadata={"hnsw:space": "cosine"}
-            )
-            self.resource_collection = self.client.get_or_create_collection(
-                name="aws_resources",
-                metadata={"hnsw:space": "cosine"}
-            )
+            # Recreate the collection
+            self.collection = self._open_collection()
+            self._invalidate_searches()
             logger.info("All collections cleared and recreated")
         except Exception as e:
             logger.error(f"Error clearing collections: {str(e)}")
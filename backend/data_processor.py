@@ -5,13 +5,30 @@ Handles batch processing of AWS data and optimization analysis
 
 import logging
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rows per Parquet row group in export_to_parquet
+PARQUET_ROW_GROUP_SIZE = 64_000
+
 
 class DataProcessor:
     """Process and analyze AWS cost and usage data"""
@@ -36,8 +53,18 @@ class DataProcessor:
             # Convert usage to float
             df["usage"] = pd.to_numeric(df.get("usage", 0), errors="coerce").fillna(0)
 
-            # Convert date to datetime
-            df["date"] = pd.to_datetime(df.get("date", datetime.now()))
+            # Convert date to datetime; Cost Explorer dates are ISO 8601, which
+            # parses on the vectorized path. Anything else gets the slower
+            # inferred parse, and dates that still fail become NaT
+            if "date" in df:
+                raw_dates = df["date"]
+                dates = pd.to_datetime(raw_dates, format="ISO8601", cache=True, errors="coerce")
+                unparsed = dates.isna() & raw_dates.notna()
+                if unparsed.any():
+                    dates[unparsed] = pd.to_datetime(raw_dates[unparsed], errors="coerce")
+                df["date"] = dates
+            else:
+                df["date"] = pd.Timestamp(datetime.now())
 
             logger.info(f"Processed {len(df)} cost records")
             return df
@@ -47,13 +74,61 @@ class DataProcessor:
             return pd.DataFrame()
 
     @staticmethod
-    def calculate_trends(cost_data: pd.DataFrame, window: int = 7) -> Dict[str, Any]:
+    def daily_costs(cost_data: pd.DataFrame) -> pd.Series:
+        """
+        Total cost per date
+        
+        Compute this once and pass it to calculate_trends, identify_anomalies
+        and forecast_costs to share a single groupby between them.
+        
+        Args:
+            cost_data: DataFrame with cost data
+        
+        Returns:
+            Series of summed costs indexed by date
+        """
+        # One sorted factorize pass gives integer group keys for bincount;
+        # missing dates get code -1 and are left out, as in a groupby
+        codes, dates = pd.factorize(cost_data["date"], sort=True)
+        costs = cost_data["cost"].to_numpy(dtype=np.float64)
+        valid = codes >= 0
+        if not valid.all():
+            codes, costs = codes[valid], costs[valid]
+        sums = np.bincount(codes, weights=costs, minlength=len(dates))
+        return pd.Series(sums, index=pd.Index(dates, name="date"), name="cost")
+
+    @staticmethod
+    def analyze_daily_costs(cost_data: pd.DataFrame, window: int = 7, threshold: float = 2.0,
+                            days_ahead: int = 30) -> Dict[str, Any]:
+        """
+        Run trend, anomaly and forecast analysis over one daily aggregation
+        
+        Args:
+            cost_data: DataFrame with cost data
+            window: Rolling window size for trends
+            threshold: Standard deviation threshold for anomalies
+            days_ahead: Number of days to forecast
+        
+        Returns:
+            Dictionary with trends, anomalies and forecast
+        """
+        daily_costs = DataProcessor.daily_costs(cost_data) if not cost_data.empty else None
+        return {
+            "trends": DataProcessor.calculate_trends(cost_data, window, daily_costs=daily_costs),
+            "anomalies": DataProcessor.identify_anomalies(cost_data, threshold, daily_costs=daily_costs),
+            "forecast": DataProcessor.forecast_costs(cost_data, days_ahead, daily_costs=daily_costs),
+        }
+
+    @staticmethod
+    def calculate_trends(cost_data: pd.DataFrame, window: int = 7,
+                         daily_costs: Optional[pd.Series] = None) -> Dict[str, Any]:
         """
         Calculate cost trends
         
         Args:
             cost_data: DataFrame with cost data
             window: Rolling window size
+            daily_costs: Precomputed daily_costs(cost_data), if already available
         
         Returns:
             Dictionary with trend analysis
@@ -63,7 +138,8 @@ class DataProcessor:
                 return {}
 
             # Group by date and sum costs
-            daily_costs = cost_data.groupby("date")["cost"].sum()
+            if daily_costs is None:
+                daily_costs = DataProcessor.daily_costs(cost_data)
 
             # Calculate rolling average
             rolling_avg = daily_costs.rolling(window=window).mean()
@@ -89,13 +165,15 @@ class DataProcessor:
             return {}
 
     @staticmethod
-    def identify_anomalies(cost_data: pd.DataFrame, threshold: float = 2.0) -> List[Dict[str, Any]]:
+    def identify_anomalies(cost_data: pd.DataFrame, threshold: float = 2.0,
+                           daily_costs: Optional[pd.Series] = None) -> List[Dict[str, Any]]:
         """
         Identify cost anomalies using statistical analysis
         
         Args:
             cost_data: DataFrame with cost data
             threshold: Standard deviation threshold
+            daily_costs: Precomputed daily_costs(cost_data), if already available
         
         Returns:
             List of anomalies
@@ -105,24 +183,28 @@ class DataProcessor:
                 return []
 
             # Group by date and sum costs
-            daily_costs = cost_data.groupby("date")["cost"].sum()
+            if daily_costs is None:
+                daily_costs = DataProcessor.daily_costs(cost_data)
 
-            # Calculate mean and std
-            mean = daily_costs.mean()
+            # Calculate mean and std (sample std, as pandas computes it)
+            costs = daily_costs.to_numpy(dtype=np.float64)
+            mean = costs.mean()
             std = daily_costs.std()
 
-            # Identify anomalies
-            anomalies = []
-            for date, cost in daily_costs.items():
-                z_score = abs((cost - mean) / std) if std != 0 else 0
-
-                if z_score > threshold:
-                    anomalies.append({
-                        "date": date.isoformat(),
-                        "cost": float(cost),
-                        "z_score": float(z_score),
-                        "deviation": float((cost - mean) / mean * 100) if mean != 0 else 0,
-                    })
+            # Identify anomalies: score every day at once, then build results
+            # only for the days over the threshold
+            z_scores = np.abs((costs - mean) / std) if std != 0 else np.zeros_like(costs)
+            dates = daily_costs.index
+
+            anomalies = [
+                {
+                    "date": dates[i].isoformat(),
+                    "cost": float(costs[i]),
+                    "z_score": float(z_scores[i]),
+                    "deviation": float((costs[i] - mean) / mean * 100) if mean != 0 else 0,
+                }
+                for i in np.flatnonzero(z_scores > threshold)
+            ]
 
             logger.info(f"Identified {len(anomalies)} cost anomalies")
             return anomalies
@@ -132,13 +214,15 @@ class DataProcessor:
             return []
 
     @staticmethod
-    def forecast_costs(cost_data: pd.DataFrame, days_ahead: int = 30) -> List[Dict[str, Any]]:
+    def forecast_costs(cost_data: pd.DataFrame, days_ahead: int = 30,
+                       daily_costs: Optional[pd.Series] = None) -> List[Dict[str, Any]]:
         """
         Forecast future costs using simple trend analysis
         
         Args:
             cost_data: DataFrame with cost data
             days_ahead: Number of days to forecast
+            daily_costs: Precomputed daily_costs(cost_data), if already available
         
         Returns:
             List of forecasted costs
@@ -148,33 +232,25 @@ class DataProcessor:
                 return []
 
             # Group by date and sum costs
-            daily_costs = cost_data.groupby("date")["cost"].sum()
+            if daily_costs is None:
+                daily_costs = DataProcessor.daily_costs(cost_data)
 
             # Calculate average daily cost
-            avg_cost = daily_costs.mean()
+            y = daily_costs.to_numpy(dtype=np.float64)
+            avg_cost = y.mean()
 
-            # Calculate trend
-            x = range(len(daily_costs))
-            y = daily_costs.values
-
-            # Simple linear regression
-            n = len(x)
-            slope = (n * sum(x[i] * y[i] for i in range(n)) - sum(x) * sum(y)) / (
-                n * sum(x[i] ** 2 for i in range(n)) - sum(x) ** 2
-            )
+            # Calculate trend (least-squares slope; a single day has no trend)
+            slope = np.polyfit(np.arange(y.size, dtype=np.float64), y, 1)[0] if y.size > 1 else 0.0
 
             # Generate forecast
-            forecast = []
-            last_date = daily_costs.index[-1]
-
-            for i in range(1, days_ahead + 1):
-                forecast_date = last_date + timedelta(days=i)
-                forecast_cost = avg_cost + (slope * i)
+            steps = np.arange(1, days_ahead + 1, dtype=np.float64)
+            forecast_costs = np.maximum(avg_cost + slope * steps, 0.0).tolist()
+            forecast_dates = pd.date_range(daily_costs.index[-1] + timedelta(days=1), periods=days_ahead)
 
-                forecast.append({
-                    "date": forecast_date.isoformat(),
-                    "forecasted_cost": max(0, float(forecast_cost)),
-                })
+            forecast = [
+                {"date": forecast_date.isoformat(), "forecasted_cost": forecast_cost}
+                for forecast_date, forecast_cost in zip(forecast_dates, forecast_costs)
+            ]
 
             logger.info(f"Generated {len(forecast)} cost forecasts")
             return forecast
@@ -198,31 +274,22 @@ class DataProcessor:
             if cost_data.empty:
                 return []
 
-            # Group by service
-            service_costs = cost_data.groupby("service").agg({
-                "cost": ["sum", "mean", "count"],
-                "usage": "sum"
-            }).reset_index()
-
-            service_costs.columns = ["service", "total_cost", "avg_cost", "count", "total_usage"]
+            # One groupby pass with the output names used by the result dicts
+            cost = cost_data["cost"].astype(np.float64).groupby(cost_data["service"])
+            service_costs = cost.agg(total_cost="sum", average_cost="mean", usage_count="count").reset_index()
 
             # Calculate percentage
             total = service_costs["total_cost"].sum()
             service_costs["percentage"] = (service_costs["total_cost"] / total * 100
-                                          if total > 0 else 0)
+                                          if total > 0 else 0.0)
 
             # Sort by cost
             service_costs = service_costs.sort_values("total_cost", ascending=False)
 
-            result = []
-            for _, row in service_costs.iterrows():
-                result.append({
-                    "service": row["service"],
-                    "total_cost": float(row["total_cost"]),
-                    "average_cost": float(row["avg_cost"]),
-                    "percentage": float(row["percentage"]),
-                    "usage_count": int(row["count"]),
-                })
+            # Columnar export; to_dict converts numpy scalars to float/int
+            result = service_costs[
+                ["service", "total_cost", "average_cost", "percentage", "usage_count"]
+            ].to_dict(orient="records")
 
             logger.info(f"Analyzed {len(result)} services")
             return result
@@ -277,8 +344,22 @@ class DataProcessor:
             Success status
         """
         try:
-            with open(filepath, "w") as f:
-                json.dump(data, f, indent=2, default=str)
+            if ORJSON_AVAILABLE:
+                # C serializer; numpy values are encoded natively. Datetimes are
+                # passed through to default=str so they keep json.dump's
+                # "2024-01-02 00:00:00" form. NaN is written as null.
+                with open(filepath, "wb") as f:
+                    f.write(orjson.dumps(
+                        data,
+                        default=str,
+                        option=(
+                            orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                            | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                        ),
+                    ))
+            else:
+                with open(filepath, "w") as f:
+                    json.dump(data, f, indent=2, default=str)
 
             logger.info(f"Data exported to {filepath}")
             return True
@@ -300,10 +381,74 @@ class DataProcessor:
             Success status
         """
         try:
-            df.to_csv(filepath, index=False)
+            written = False
+            if PYARROW_AVAILABLE:
+                try:
+                    # Arrow's multithreaded C++ writer; strings are always quoted
+                    pa_csv.write_csv(DataProcessor._to_arrow(df), filepath)
+                    written = True
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as e:
+                    # e.g. object columns holding dicts or lists, which pandas stringifies
+                    logger.info(f"Arrow CSV writer cannot export this frame, using pandas: {str(e)}")
+            if not written:
+                df.to_csv(filepath, index=False)
             logger.info(f"Data exported to {filepath}")
             return True
 
         except Exception as e:
             logger.error(f"Error exporting data: {str(e)}")
             return False
+
+    @staticmethod
+    def export_to_parquet(df: pd.DataFrame, filepath: str) -> bool:
+        """
+        Export DataFrame to a zstd-compressed Parquet file
+        
+        Args:
+            df: DataFrame to export
+            filepath: Output file path
+        
+        Returns:
+            Success status
+        """
+        try:
+            if not PYARROW_AVAILABLE:
+                logger.error("pyarrow is required for Parquet export")
+                return False
+
+            df.to_parquet(
+                filepath,
+                engine="pyarrow",
+                compression="zstd",
+                index=False,
+                row_group_size=PARQUET_ROW_GROUP_SIZE,
+            )
+            logger.info(f"Data exported to {filepath}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error exporting data: {str(e)}")
+            return False
+
+    @staticmethod
+    def _to_arrow(df: pd.DataFrame) -> "pa.Table":
+        """
+        Convert a DataFrame to an Arrow table for CSV export
+        
+        Datetime columns holding only whole days become dates, so they are
+        written as YYYY-MM-DD like pandas does rather than with a time part.
+        
+        Args:
+            df: DataFrame to convert
+        
+        Returns:
+            Arrow table without the index
+        """
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        for name in df.columns:
+            column = df[name]
+            if (pd.api.types.is_datetime64_dtype(column.dtype)
+                    and column.dropna().eq(column.dropna().dt.normalize()).all()):
+                index = table.schema.get_field_index(str(name))
+                table = table.set_column(index, str(name), table.column(index).cast(pa.date32()))
+        return table
@@ -3,13 +3,22 @@ Database Module
 Handles persistent storage of chatbot data and history
 """
 
+import atexit
 import logging
 import json
-from typing import List, Dict, Any, Optional
-from datetime import datetime
-from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer, Text, JSON
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Dict, Any, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, event, insert, inspect, text, Column, Index, String, UniqueConstraint, Float, DateTime, Integer, Text, JSON
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import scoped_session, sessionmaker, Session
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.pool import StaticPool
 from config import config
 
 logging.basicConfig(level=logging.INFO)
@@ -17,29 +26,130 @@ logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 
+# Rows per INSERT batch for the bulk_* methods
+BULK_INSERT_BATCH_SIZE = 1024
+
+# Unique constraint on cost records; _upgrade_schema adds it to older databases
+COST_UNIQUE_NAME = "uq_cost_service_region_date"
+
+# PRAGMAs applied to every SQLite connection: WAL lets readers run alongside the
+# sync writes, and synchronous=NORMAL only fsyncs at WAL checkpoints
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Chat history write buffer: flush every N seconds or once this many rows are queued
+CHAT_FLUSH_INTERVAL = 5.0
+CHAT_BUFFER_MAX_SIZE = 500
+
+
+def generate_id() -> str:
+    """
+    Generate a UUIDv7 string
+    
+    The leading 48 bits are the Unix time in milliseconds, so new ids sort
+    after older ones and primary-key inserts land on the rightmost index page
+    instead of a random one.
+    
+    Returns:
+        UUID string
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return str(uuid.UUID(int=value))
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Tune a new SQLite connection for append-heavy writes"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO date string, passing datetimes and empty values through"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def _cost_row(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an incoming cost record to CostRecord columns"""
+    return {
+        "id": record.get("id") or generate_id(),
+        "service": record.get("service"),
+        "region": record.get("region"),
+        "cost": record.get("cost"),
+        "usage": record.get("usage"),
+        "date": _parse_datetime(record.get("date")),
+    }
+
+
+def _resource_row(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an incoming resource record to ResourceRecord columns"""
+    return {
+        "id": record.get("id") or generate_id(),
+        "instance_id": record.get("instance_id"),
+        "instance_type": record.get("instance_type"),
+        "state": record.get("state"),
+        "region": record.get("region"),
+        "launch_time": _parse_datetime(record.get("launch_time")),
+        "tags": record.get("tags"),
+    }
+
+
+def _insight_row(insight: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an incoming insight to OptimizationInsight columns"""
+    return {
+        "id": insight.get("id") or generate_id(),
+        "title": insight.get("title"),
+        "description": insight.get("description"),
+        "category": insight.get("category"),
+        "priority": insight.get("priority"),
+        "potential_savings": insight.get("potential_savings"),
+        "recommendation": insight.get("recommendation"),
+    }
+
 
 class CostRecord(Base):
     """Cost record model"""
     __tablename__ = "cost_records"
 
-    id = Column(String, primary_key=True)
+    id = Column(String, primary_key=True, default=generate_id)
     service = Column(String, index=True)
     region = Column(String, index=True)
     cost = Column(Float)
     usage = Column(Float)
     date = Column(DateTime, index=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    __table_args__ = (
+        # One row per service, region and day so a re-sync does not duplicate costs
+        UniqueConstraint("service", "region", "date", name=COST_UNIQUE_NAME),
+        # Dashboard filters: one service or region over a date range
+        Index("ix_cost_service_date", "service", "date"),
+        Index("ix_cost_region_date", "region", "date"),
+    )
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
+        """Convert to dictionary (datetimes are left for the JSON provider to encode)"""
         return {
             "id": self.id,
             "service": self.service,
             "region": self.region,
             "cost": self.cost,
             "usage": self.usage,
-            "date": self.date.isoformat() if self.date else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "date": self.date,
+            "created_at": self.created_at,
         }
 
 
@@ -47,7 +157,7 @@ class ResourceRecord(Base):
     """Resource record model"""
     __tablename__ = "resource_records"
 
-    id = Column(String, primary_key=True)
+    id = Column(String, primary_key=True, default=generate_id)
     instance_id = Column(String, index=True)
     instance_type = Column(String)
     state = Column(String)
@@ -57,16 +167,16 @@ class ResourceRecord(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
+        """Convert to dictionary (datetimes are left for the JSON provider to encode)"""
         return {
             "id": self.id,
             "instance_id": self.instance_id,
             "instance_type": self.instance_type,
             "state": self.state,
             "region": self.region,
-            "launch_time": self.launch_time.isoformat() if self.launch_time else None,
+            "launch_time": self.launch_time,
             "tags": self.tags,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "created_at": self.created_at,
         }
 
 
@@ -74,7 +184,7 @@ class OptimizationInsight(Base):
     """Optimization insight model"""
     __tablename__ = "optimization_insights"
 
-    id = Column(String, primary_key=True)
+    id = Column(String, primary_key=True, default=generate_id)
     title = Column(String, index=True)
     description = Column(Text)
     category = Column(String, index=True)
@@ -85,8 +195,18 @@ class OptimizationInsight(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # Partial index for get_optimization_insights' status="active" filter
+        Index(
+            "ix_insight_active",
+            "status",
+            postgresql_where=text("status = 'active'"),
+            sqlite_where=text("status = 'active'"),
+        ),
+    )
+
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
+        """Convert to dictionary (datetimes are left for the JSON provider to encode)"""
         return {
             "id": self.id,
             "title": self.title,
@@ -96,8 +216,8 @@ class OptimizationInsight(Base):
             "potential_savings": self.potential_savings,
             "recommendation": self.recommendation,
             "status": self.status,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
 
 
@@ -105,22 +225,27 @@ class ChatHistory(Base):
     """Chat history model"""
     __tablename__ = "chat_history"
 
-    id = Column(String, primary_key=True)
+    id = Column(String, primary_key=True, default=generate_id)
     conversation_id = Column(String, index=True)
     user_message = Column(Text)
     bot_response = Column(Text)
     context = Column(JSON)
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
+    __table_args__ = (
+        # Covers get_chat_history's filter on conversation and newest-first sort
+        Index("ix_chat_conv_created", conversation_id, created_at.desc()),
+    )
+
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
+        """Convert to dictionary (datetimes are left for the JSON provider to encode)"""
         return {
             "id": self.id,
             "conversation_id": self.conversation_id,
             "user_message": self.user_message,
             "bot_response": self.bot_response,
             "context": self.context,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "created_at": self.created_at,
         }
 
 
@@ -128,7 +253,7 @@ class SyncHistory(Base):
     """Sync history model"""
     __tablename__ = "sync_history"
 
-    id = Column(String, primary_key=True)
+    id = Column(String, primary_key=True, default=generate_id)
     status = Column(String)
     data_points = Column(Integer)
     insights_generated = Column(Integer)
@@ -137,7 +262,7 @@ class SyncHistory(Base):
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
+        """Convert to dictionary (datetimes are left for the JSON provider to encode)"""
         return {
             "id": self.id,
             "status": self.status,
@@ -145,10 +270,88 @@ class SyncHistory(Base):
             "insights_generated": self.insights_generated,
             "error_message": self.error_message,
             "duration_seconds": self.duration_seconds,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "created_at": self.created_at,
         }
 
 
+def _chat_row(chat: Dict[str, Any]) -> Dict[str, Any]:
+    """Map an incoming chat turn to ChatHistory columns"""
+    return {
+        "id": chat.get("id") or generate_id(),
+        "conversation_id": chat.get("conversation_id"),
+        "user_message": chat.get("user_message"),
+        "bot_response": chat.get("bot_response"),
+        "context": chat.get("context"),
+        # Stamp now so buffered rows keep their real order once flushed
+        "created_at": datetime.utcnow(),
+    }
+
+
+class ChatHistoryBuffer:
+    """Queue chat history rows in memory and write them in batches"""
+
+    def __init__(
+        self,
+        flush_fn: Callable[[List[Dict[str, Any]]], bool],
+        flush_interval: float = CHAT_FLUSH_INTERVAL,
+        max_size: int = CHAT_BUFFER_MAX_SIZE,
+    ):
+        """
+        Initialize chat history buffer
+        
+        Args:
+            flush_fn: Callable that persists a batch of rows
+            flush_interval: Seconds between background flushes
+            max_size: Queued rows that trigger an early flush
+        """
+        self.flush_fn = flush_fn
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="chat-history-flush", daemon=True)
+        self._thread.start()
+
+    def append(self, row: Dict[str, Any]) -> None:
+        """Queue a row, waking the flush thread when the buffer is full"""
+        with self._lock:
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.max_size
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        """Write all queued rows"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._buffer:
+                    return
+                batch = list(self._buffer)
+                self._buffer.clear()
+            if not self.flush_fn(batch):
+                logger.error(f"Dropped {len(batch)} chat history rows after a failed flush")
+
+    def stop(self) -> None:
+        """Stop the flush thread and write anything still queued"""
+        self._stopped.set()
+        self._wakeup.set()
+        self._thread.join(timeout=self.flush_interval)
+        self.flush()
+
+    def _run(self) -> None:
+        """Flush on a timer or when woken by a full buffer"""
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing chat history: {str(e)}")
+
+
 class DatabaseManager:
     """Manage database operations"""
 
@@ -160,41 +363,117 @@ class DatabaseManager:
             database_url: Database connection URL
         """
         self.database_url = database_url or config.DATABASE_URL
-        self.engine = create_engine(
-            self.database_url,
-            echo=config.DATABASE_ECHO
-        )
-        self.SessionLocal = sessionmaker(bind=self.engine)
+
+        is_sqlite = self.database_url.startswith("sqlite")
+        is_memory = self.database_url in ("sqlite://", "sqlite:///:memory:")
+
+        engine_kwargs = {"echo": config.DATABASE_ECHO, "pool_pre_ping": True}
+        if not is_sqlite:
+            # SQLite uses its own single-file pool; size the pool for server databases
+            engine_kwargs["pool_size"] = config.DATABASE_POOL_SIZE
+            engine_kwargs["max_overflow"] = config.DATABASE_MAX_OVERFLOW
+            # Rows per multi-row INSERT ... VALUES emitted by bulk_insert_mappings
+            engine_kwargs["insertmanyvalues_page_size"] = BULK_INSERT_BATCH_SIZE
+        elif is_memory:
+            # An in-memory database lives on one connection; share it with the background threads
+            engine_kwargs["poolclass"] = StaticPool
+            engine_kwargs["connect_args"] = {"check_same_thread": False}
+
+        self.engine = create_engine(self.database_url, **engine_kwargs)
+        if is_sqlite and not is_memory:
+            event.listen(self.engine, "connect", _set_sqlite_pragmas)
+        self.SessionLocal = scoped_session(sessionmaker(bind=self.engine, expire_on_commit=False))
         self._init_db()
+        self.chat_buffer = ChatHistoryBuffer(
+            lambda rows: self._bulk_insert(ChatHistory, rows, "chat history rows")
+        )
+        atexit.register(self.chat_buffer.stop)
         logger.info(f"Database initialized: {self.database_url}")
 
     def _init_db(self) -> None:
         """Initialize database tables"""
         try:
             Base.metadata.create_all(self.engine)
+            self._upgrade_schema()
             logger.info("Database tables created")
         except Exception as e:
             logger.error(f"Error initializing database: {str(e)}")
 
+    def _upgrade_schema(self) -> None:
+        """
+        Add indexes and constraints missing from tables created by an older version
+        
+        create_all only creates missing tables, so a database created before the
+        cost record unique constraint and the composite indexes existed would
+        otherwise never get them, and ON CONFLICT DO NOTHING would have nothing
+        to conflict on. Every step is skipped once applied.
+        """
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
+
+        inspector = inspect(self.engine)
+        table = CostRecord.__tablename__
+        existing = {c["name"] for c in inspector.get_unique_constraints(table)}
+        existing |= {i["name"] for i in inspector.get_indexes(table)}
+        if COST_UNIQUE_NAME in existing:
+            return
+
+        with self.engine.begin() as conn:
+            # Keep one row per key so the unique index can be built; rows with a
+            # NULL key never conflict, so they are left alone
+            removed = conn.execute(text(
+                f"DELETE FROM {table} "
+                "WHERE service IS NOT NULL AND region IS NOT NULL AND date IS NOT NULL "
+                "AND id NOT IN (SELECT keep_id FROM "
+                f"(SELECT MIN(id) AS keep_id FROM {table} GROUP BY service, region, date) AS keep)"
+            )).rowcount
+            conn.execute(text(
+                f"CREATE UNIQUE INDEX {COST_UNIQUE_NAME} ON {table} (service, region, date)"
+            ))
+        logger.info(f"Added {COST_UNIQUE_NAME} to {table}, removing {removed} duplicate rows")
+
     def get_session(self) -> Session:
         """Get database session"""
         return self.SessionLocal()
 
-    def add_cost_record(self, record: Dict[str, Any]) -> bool:
-        """Add cost record"""
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        """Yield the thread's session, committing on success and rolling back on error"""
+        session = self.SessionLocal()
         try:
-            session = self.get_session()
-            cost_record = CostRecord(
-                id=record.get("id"),
-                service=record.get("service"),
-                region=record.get("region"),
-                cost=record.get("cost"),
-                usage=record.get("usage"),
-                date=datetime.fromisoformat(record.get("date")) if record.get("date") else None,
-            )
-            session.add(cost_record)
+            yield session
             session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
             session.close()
+
+    def _insert_ignore(self, model):
+        """
+        Build an INSERT that skips rows violating a unique constraint
+        
+        Args:
+            model: ORM model class
+        
+        Returns:
+            Insert statement for the engine's dialect
+        """
+        dialect = self.engine.dialect.name
+        if dialect == "postgresql":
+            return postgresql.insert(model).on_conflict_do_nothing()
+        if dialect == "sqlite":
+            return sqlite.insert(model).on_conflict_do_nothing()
+        if dialect in ("mysql", "mariadb"):
+            return insert(model).prefix_with("IGNORE")
+        return insert(model)
+
+    def add_cost_record(self, record: Dict[str, Any]) -> bool:
+        """Add cost record, ignoring one already stored for the same service, region and date"""
+        try:
+            with self._session() as session:
+                session.execute(self._insert_ignore(CostRecord), [_cost_row(record)])
             return True
         except Exception as e:
             logger.error(f"Error adding cost record: {str(e)}")
@@ -203,19 +482,9 @@ class DatabaseManager:
     def add_resource_record(self, record: Dict[str, Any]) -> bool:
         """Add resource record"""
         try:
-            session = self.get_session()
-            resource_record = ResourceRecord(
-                id=record.get("id"),
-                instance_id=record.get("instance_id"),
-                instance_type=record.get("instance_type"),
-                state=record.get("state"),
-                region=record.get("region"),
-                launch_time=datetime.fromisoformat(record.get("launch_time")) if record.get("launch_time") else None,
-                tags=record.get("tags"),
-            )
-            session.add(resource_record)
-            session.commit()
-            session.close()
+            with self._session() as session:
+                resource_record = ResourceRecord(**_resource_row(record))
+                session.add(resource_record)
             return True
         except Exception as e:
             logger.error(f"Error adding resource record: {str(e)}")
@@ -224,38 +493,18 @@ class DatabaseManager:
     def add_optimization_insight(self, insight: Dict[str, Any]) -> bool:
         """Add optimization insight"""
         try:
-            session = self.get_session()
-            opt_insight = OptimizationInsight(
-                id=insight.get("id"),
-                title=insight.get("title"),
-                description=insight.get("description"),
-                category=insight.get("category"),
-                priority=insight.get("priority"),
-                potential_savings=insight.get("potential_savings"),
-                recommendation=insight.get("recommendation"),
-            )
-            session.add(opt_insight)
-            session.commit()
-            session.close()
+            with self._session() as session:
+                opt_insight = OptimizationInsight(**_insight_row(insight))
+                session.add(opt_insight)
             return True
         except Exception as e:
             logger.error(f"Error adding optimization insight: {str(e)}")
             return False
 
     def add_chat_history(self, chat: Dict[str, Any]) -> bool:
-        """Add chat history"""
+        """Queue chat history; rows are written in batches by the chat buffer"""
         try:
-            session = self.get_session()
-            chat_record = ChatHistory(
-                id=chat.get("id"),
-                conversation_id=chat.get("conversation_id"),
-                user_message=chat.get("user_message"),
-                bot_response=chat.get("bot_response"),
-                context=chat.get("context"),
-            )
-            session.add(chat_record)
-            session.commit()
-            session.close()
+            self.chat_buffer.append(_chat_row(chat))
             return True
         except Exception as e:
             logger.error(f"Error adding chat history: {str(e)}")
@@ -264,42 +513,124 @@ class DatabaseManager:
     def add_sync_history(self, sync: Dict[str, Any]) -> bool:
         """Add sync history"""
         try:
-            session = self.get_session()
-            sync_record = SyncHistory(
-                id=sync.get("id"),
-                status=sync.get("status"),
-                data_points=sync.get("data_points"),
-                insights_generated=sync.get("insights_generated"),
-                error_message=sync.get("error_message"),
-                duration_seconds=sync.get("duration_seconds"),
-            )
-            session.add(sync_record)
-            session.commit()
-            session.close()
+            with self._session() as session:
+                sync_record = SyncHistory(
+                    id=sync.get("id") or generate_id(),
+                    status=sync.get("status"),
+                    data_points=sync.get("data_points"),
+                    insights_generated=sync.get("insights_generated"),
+                    error_message=sync.get("error_message"),
+                    duration_seconds=sync.get("duration_seconds"),
+                )
+                session.add(sync_record)
             return True
         except Exception as e:
             logger.error(f"Error adding sync history: {str(e)}")
             return False
 
-    def get_cost_records(self, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
-        """Get cost records"""
+    def _bulk_insert(
+        self,
+        model,
+        rows: List[Dict[str, Any]],
+        label: str,
+        ignore_conflicts: bool = False
+    ) -> bool:
+        """
+        Insert rows in batches inside a single transaction
+        
+        Args:
+            model: ORM model class
+            rows: Column mappings for the model
+            label: Record type used in log messages
+            ignore_conflicts: Skip rows that violate a unique constraint
+        
+        Returns:
+            Success status
+        """
+        if not rows:
+            return True
+
+        try:
+            with self._session() as session:
+                stmt = self._insert_ignore(model) if ignore_conflicts else None
+                for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+                    batch = rows[start:start + BULK_INSERT_BATCH_SIZE]
+                    if stmt is not None:
+                        session.execute(stmt, batch)
+                    else:
+                        session.bulk_insert_mappings(model, batch)
+            logger.info(f"Bulk inserted {len(rows)} {label}")
+            return True
+        except Exception as e:
+            logger.error(f"Error bulk inserting {label}: {str(e)}")
+            return False
+
+    def add_cost_records_bulk(self, records: List[Dict[str, Any]]) -> bool:
+        """Add many cost records in one transaction, ignoring ones already stored"""
         try:
-            session = self.get_session()
-            records = session.query(CostRecord).limit(limit).offset(offset).all()
-            result = [r.to_dict() for r in records]
-            session.close()
+            rows = [_cost_row(r) for r in records]
+        except Exception as e:
+            logger.error(f"Error preparing cost records: {str(e)}")
+            return False
+        # Re-syncing an overlapping date range skips rows that are already stored
+        return self._bulk_insert(CostRecord, rows, "cost records", ignore_conflicts=True)
+
+    def get_cost_records(self, limit: int = 100, after_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get a page of cost records ordered by id, starting after after_id"""
+        try:
+            with self._session() as session:
+                query = session.query(CostRecord)
+                if after_id is not None:
+                    query = query.filter(CostRecord.id > after_id)
+                records = query.order_by(CostRecord.id).limit(limit)
+                result = [r.to_dict() for r in records]
             return result
         except Exception as e:
             logger.error(f"Error getting cost records: {str(e)}")
             return []
 
+    def iter_cost_records(
+        self,
+        after_id: Optional[str] = None,
+        limit: Optional[int] = None,
+        batch_size: int = 200
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream cost records ordered by id without loading them all
+        
+        Uses keyset pagination (id > after_id) rather than OFFSET, and fetches
+        rows from the cursor in batches of batch_size.
+        
+        Args:
+            after_id: Only return records whose id sorts after this one
+            limit: Maximum number of records (None for all)
+            batch_size: Rows fetched per round-trip
+        
+        Yields:
+            Cost record dictionaries
+        """
+        # A dedicated session, so a long stream does not hold the thread's scoped session
+        session = self.SessionLocal.session_factory()
+        try:
+            query = session.query(CostRecord)
+            if after_id is not None:
+                query = query.filter(CostRecord.id > after_id)
+            query = query.order_by(CostRecord.id)
+            if limit is not None:
+                query = query.limit(limit)
+            for record in query.yield_per(batch_size):
+                yield record.to_dict()
+        except Exception as e:
+            logger.error(f"Error streaming cost records: {str(e)}")
+        finally:
+            session.close()
+
     def get_optimization_insights(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get optimization insights"""
         try:
-            session = self.get_session()
-            records = session.query(OptimizationInsight).filter_by(status="active").limit(limit).all()
-            result = [r.to_dict() for r in records]
-            session.close()
+            with self._session() as session:
+                records = session.query(OptimizationInsight).filter_by(status="active").limit(limit).all()
+                result = [r.to_dict() for r in records]
             return result
         except Exception as e:
             logger.error(f"Error getting optimization insights: {str(e)}")
@@ -308,12 +639,12 @@ class DatabaseManager:
     def get_chat_history(self, conversation_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get chat history for conversation"""
         try:
-            session = self.get_session()
-            records = session.query(ChatHistory).filter_by(
-                conversation_id=conversation_id
-            ).order_by(ChatHistory.created_at.desc()).limit(limit).all()
-            result = [r.to_dict() for r in records]
-            session.close()
+            self.chat_buffer.flush()
+            with self._session() as session:
+                records = session.query(ChatHistory).filter_by(
+                    conversation_id=conversation_id
+                ).order_by(ChatHistory.created_at.desc()).limit(limit).all()
+                result = [r.to_dict() for r in records]
             return result
         except Exception as e:
             logger.error(f"Error getting chat history: {str(e)}")
@@ -322,12 +653,11 @@ class DatabaseManager:
     def get_sync_history(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get sync history"""
         try:
-            session = self.get_session()
-            records = session.query(SyncHistory).order_by(
-                SyncHistory.created_at.desc()
-            ).limit(limit).all()
-            result = [r.to_dict() for r in records]
-            session.close()
+            with self._session() as session:
+                records = session.query(SyncHistory).order_by(
+                    SyncHistory.created_at.desc()
+                ).limit(limit).all()
+                result = [r.to_dict() for r in records]
             return result
         except Exception as e:
             logger.error(f"Error getting sync history: {str(e)}")
@@ -336,17 +666,42 @@ class DatabaseManager:
     def clear_old_records(self, days: int = 90) -> bool:
         """Clear records older than specified days"""
         try:
-            session = self.get_session()
             cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-            session.query(CostRecord).filter(CostRecord.created_at < cutoff_date).delete()
-            session.query(ChatHistory).filter(ChatHistory.created_at < cutoff_date).delete()
-            session.query(SyncHistory).filter(SyncHistory.created_at < cutoff_date).delete()
+            # One transaction for all three deletes; skip syncing ORM state since nothing is loaded
+            with self._session() as session:
+                for model in (CostRecord, ChatHistory, SyncHistory):
+                    session.query(model).filter(model.created_at < cutoff_date).delete(
+                        synchronize_session=False
+                    )
 
-            session.commit()
-            session.close()
             logger.info(f"Cleared records older than {days} days")
             return True
         except Exception as e:
             logger.error(f"Error clearing old records: {str(e)}")
             return False
+
+    def start_retention_janitor(self, days: int = 90, interval_seconds: float = 3600) -> threading.Event:
+        """
+        Prune old records periodically in a background thread
+        
+        Each pass only removes rows that aged out since the previous one, so the
+        indexed deletes stay small instead of sweeping months of data at once.
+        
+        Args:
+            days: Retention period in days
+            interval_seconds: Seconds between passes
+        
+        Returns:
+            Event that stops the janitor when set
+        """
+        stop_event = threading.Event()
+
+        def _run() -> None:
+            while not stop_event.wait(interval_seconds):
+                self.clear_old_records(days=days)
+
+        self.clear_old_records(days=days)
+        threading.Thread(target=_run, name="retention-janitor", daemon=True).start()
+        logger.info(f"Retention janitor started: {days} days, every {interval_seconds}s")
+        return stop_event
@@ -4,11 +4,50 @@ Provides endpoints for customers to send inquiries to support
 """
 
 from flask import Blueprint, request, jsonify
+from pydantic import BaseModel, EmailStr, ValidationError
 from email_service import EmailService
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+class InquiryIn(BaseModel):
+    """Payload for /send-inquiry"""
+    customer_name: str
+    customer_email: EmailStr
+    subject: str
+    message: str
+
+
+class OptimizationQuestionIn(BaseModel):
+    """Payload for /send-optimization-question"""
+    customer_name: str
+    customer_email: EmailStr
+    question: str
+    aws_context: str = ""
+
+
+def _parse_payload(model):
+    """
+    Validate the request body against a pydantic model
+    
+    Args:
+        model: Pydantic model class
+    
+    Returns:
+        Tuple of (payload, error response); one of them is None
+    """
+    data = request.get_json(force=True, silent=True)
+    try:
+        return model.model_validate(data), None
+    except ValidationError as e:
+        fields = sorted({str(err["loc"][0]) for err in e.errors() if err.get("loc")})
+        return None, (jsonify({
+            "status": "error",
+            "message": f"Missing or invalid fields: {', '.join(fields) or 'request body'}"
+        }), 400)
+
+
 # Create blueprint
 email_bp = Blueprint('email', __name__, url_prefix='/api/email')
 
@@ -30,26 +69,20 @@ def send_inquiry():
     }
     """
     try:
-        data = request.get_json()
-        
-        # Validate required fields
-        required_fields = ['customer_name', 'customer_email', 'subject', 'message']
-        if not all(field in data for field in required_fields):
-            return jsonify({
-                "status": "error",
-                "message": f"Missing required fields: {', '.join(required_fields)}"
-            }), 400
+        payload, error = _parse_payload(InquiryIn)
+        if error:
+            return error
         
-        # Send inquiry
+        # Queue inquiry; the email service sends it in the background
         result = email_service.send_customer_inquiry(
-            customer_name=data['customer_name'],
-            customer_email=data['customer_email'],
-            subject=data['subject'],
-            message=data['message']
+            customer_name=payload.customer_name,
+            customer_email=payload.customer_email,
+            subject=payload.subject,
+            message=payload.message
         )
         
-        if result['status'] == 'success':
-            return jsonify(result), 200
+        if result['status'] == 'queued':
+            return jsonify(result), 202
         else:
             return jsonify(result), 500
             
@@ -75,26 +108,20 @@ def send_optimization_question():
     }
     """
     try:
-        data = request.get_json()
-        
-        # Validate required fields
-        required_fields = ['customer_name', 'customer_email', 'question']
-        if not all(field in data for field in required_fields):
-            return jsonify({
-                "status": "error",
-                "message": f"Missing required fields: {', '.join(required_fields)}"
-            }), 400
+        payload, error = _parse_payload(OptimizationQuestionIn)
+        if error:
+            return error
         
-        # Send optimization question
+        # Queue optimization question; the email service sends it in the background
         result = email_service.send_aws_optimization_question(
-            customer_name=data['customer_name'],
-            customer_email=data['customer_email'],
-            question=data['question'],
-            aws_context=data.get('aws_context', '')
+            customer_name=payload.customer_name,
+            customer_email=payload.customer_email,
+            question=payload.question,
+            aws_context=payload.aws_context
         )
         
-        if result['status'] == 'success':
-            return jsonify(result), 200
+        if result['status'] == 'queued':
+            return jsonify(result), 202
         else:
             return jsonify(result), 500
             
@@ -3,41 +3,205 @@ Email Service Module
 Handles sending customer inquiries to support email (maddehclement@gmail.com)
 """
 
+import asyncio
+import atexit
 import logging
+import queue
 import smtplib
+import ssl
+import threading
+import time
 from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Sequence, Tuple, Union
 from datetime import datetime
 from dotenv import load_dotenv
+from jinja2 import Environment
 import os
 
+try:
+    import aiosmtplib
+    AIOSMTPLIB_AVAILABLE = True
+except ImportError:
+    AIOSMTPLIB_AVAILABLE = False
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
-# Load environment variables
+# Load environment variables once at import rather than per service instance
 load_dotenv()
+SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SENDER_EMAIL = os.getenv("SENDER_EMAIL", "fathi.maddeh.it@gmail.com")
+SENDER_PASSWORD = os.getenv("SENDER_PASSWORD", "211JMT9653")
+SUPPORT_EMAIL = "maddehclement@gmail.com"
+
+# Reconnect instead of reusing an SMTP session idle for longer than this (seconds)
+SMTP_IDLE_TIMEOUT = 100
+
+# "Received:" line in the support email bodies
+RECEIVED_AT_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+# Email bodies are compiled once at import; autoescape keeps customer-supplied
+# text from injecting markup into the support mailbox
+_templates = Environment(autoescape=True)
+
+# Marks where the per-email body is spliced into the shared page shell
+_BODY_MARKER = "<!--BODY-->"
+
+_SHELL_TEMPLATE = _templates.from_string("""
+        <html>
+            <head>
+                <style>
+                    body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+                    .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+                    .header { background-color: #FF9900; color: white; padding: 20px; border-radius: 5px; }
+                    .customer-info { background-color: #f9f9f9; padding: 15px; margin: 15px 0; border-radius: 5px; border-left: 4px solid #FF9900; }
+                    .message-box { background-color: #f0f8f0; padding: 15px; margin: 15px 0; border-radius: 5px; }
+                    .question-box { background-color: #e8f4f8; padding: 15px; margin: 15px 0; border-radius: 5px; }
+                    .context-box { background-color: #fff3cd; padding: 15px; margin: 15px 0; border-radius: 5px; }
+                    .footer { text-align: center; color: #666; font-size: 12px; margin-top: 20px; }
+                    h1 { color: #FF9900; }
+                    h3 { color: #333; }
+                </style>
+            </head>
+            <body>
+                <div class="container">
+                    <div class="header">
+                        <h1>{{ title }}</h1>
+""" + _BODY_MARKER + """
+                    <div class="footer">
+                        <p>FinOps Chatbot - Customer Support System</p>
+                    </div>
+                </div>
+            </body>
+        </html>
+""")
+
+
+def _render_shell(title: str) -> Tuple[str, str]:
+    """Render the static page shell once, split into the text before and after the body"""
+    prefix, suffix = _SHELL_TEMPLATE.render(title=title).split(_BODY_MARKER)
+    return prefix, suffix
+
+
+_INQUIRY_SHELL = _render_shell("New Customer Inquiry")
+_OPTIMIZATION_QUESTION_SHELL = _render_shell("AWS Optimization Question")
+
+_INQUIRY_TEMPLATE = _templates.from_string("""
+                        <p>Received: {{ received_at }}</p>
+                    </div>
+                    
+                    <div class="customer-info">
+                        <h3>Customer Information:</h3>
+                        <p><strong>Name:</strong> {{ customer_name }}</p>
+                        <p><strong>Email:</strong> {{ customer_email }}</p>
+                        <p><strong>Subject:</strong> {{ subject }}</p>
+                    </div>
+                    
+                    <div class="message-box">
+                        <h3>Message:</h3>
+                        <p>{{ message }}</p>
+                    </div>
+                    
+                    <p><strong>Action Required:</strong> Please respond to this customer at {{ customer_email }}</p>
+""")
+
+_OPTIMIZATION_QUESTION_TEMPLATE = _templates.from_string("""
+                        <p>Received: {{ received_at }}</p>
+                    </div>
+                    
+                    <div class="customer-info">
+                        <h3>Customer Information:</h3>
+                        <p><strong>Name:</strong> {{ customer_name }}</p>
+                        <p><strong>Email:</strong> {{ customer_email }}</p>
+                    </div>
+                    
+                    <div class="question-box">
+                        <h3>Question:</h3>
+                        <p>{{ question }}</p>
+                    </div>
+                    
+                    {% if aws_context %}
+                    <div class="context-box">
+                        <h3>AWS Context:</h3>
+                        <p>{{ aws_context }}</p>
+                    </div>
+                    {% endif %}
+                    
+                    <p><strong>Action Required:</strong> Please provide AWS optimization recommendations and respond to {{ customer_email }}</p>
+""")
+
+
+class _ResumingTLSContext(ssl.SSLContext):
+    """
+    SSLContext that offers the last saved TLS session on each new connection
+
+    smtplib.starttls() has no session argument, so the session is injected
+    here. A resumed handshake skips the key exchange and certificate checks.
+    """
+
+    session = None
+
+    def wrap_socket(self, sock, *args, **kwargs):
+        kwargs.setdefault("session", self.session)
+        return super().wrap_socket(sock, *args, **kwargs)
+
+
+class _AsyncSMTPPool:
+    """Pooled aiosmtplib session and its lock, owned by one event loop"""
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.server = None
+        self.last_used = 0.0
+
+
+def _create_tls_context() -> _ResumingTLSContext:
+    """Build a verifying client context equivalent to ssl.create_default_context()"""
+    context = _ResumingTLSContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.load_default_certs()
+    return context
 
 
 class EmailService:
     """Service for sending customer inquiries to support email"""
 
+    # Shared so every connection (and every instance) can resume the same TLS session
+    _tls_context = _create_tls_context()
+
     def __init__(self):
         """Initialize email service with SMTP configuration"""
-        self.smtp_server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
-        self.smtp_port = int(os.getenv("SMTP_PORT", "587"))
-        self.sender_email = os.getenv("SENDER_EMAIL", "fathi.maddeh.it@gmail.com")
-        self.sender_password = os.getenv("SENDER_PASSWORD", "211JMT9653")
-        self.support_email = "maddehclement@gmail.com"
+        self.smtp_server = SMTP_SERVER
+        self.smtp_port = SMTP_PORT
+        self.sender_email = SENDER_EMAIL
+        self.sender_password = SENDER_PASSWORD
+        self.support_email = SUPPORT_EMAIL
+
+        # One authenticated SMTP session reused across sends
+        self._smtp = None
+        self._smtp_last_used = 0.0
+        self._smtp_lock = threading.Lock()
+
+        # Separate pooled sessions for the async senders, one per event loop:
+        # asyncio locks and connections cannot be shared between loops
+        self._async_pools: Dict[asyncio.AbstractEventLoop, _AsyncSMTPPool] = {}
+        self._async_pools_lock = threading.Lock()
+
+        # Sends run on one background thread so callers never wait on SMTP
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._process_queue, name="email-sender", daemon=True)
+        self._worker.start()
+        atexit.register(self.shutdown)
         
         if not self.sender_email or not self.sender_password:
             logger.warning("Email credentials not configured in environment variables")
 
     def send_customer_inquiry(self, customer_name: str, customer_email: str, 
-                             subject: str, message: str) -> Dict[str, Any]:
+                             subject: str, message: str, wait: bool = False) -> Dict[str, Any]:
         """
         Send customer inquiry to support email
         
@@ -46,37 +210,52 @@ class EmailService:
             customer_email: Customer's email address
             subject: Subject of the inquiry
             message: Customer's message/question
+            wait: Send before returning instead of queueing
         
         Returns:
-            Dictionary with send status
+            Dictionary with send status ("queued" unless wait is set)
         """
+        now = datetime.now()
         try:
+            # Fail now rather than queueing a message the worker cannot send
+            self._check_credentials()
             email_subject = f"Customer Inquiry: {subject}"
             
             # Create HTML email body
             html_body = self._create_inquiry_html(
-                customer_name, customer_email, subject, message
+                customer_name, customer_email, subject, message,
+                now.strftime(RECEIVED_AT_FORMAT)
             )
             
+            if not wait:
+                self._queue.put((self.support_email, email_subject, html_body))
+                logger.info("Customer inquiry from %s queued for support", customer_email)
+                return {
+                    "status": "queued",
+                    "message": f"Your inquiry is being sent to our support team at {self.support_email}",
+                    "timestamp": now.isoformat()
+                }
+
             # Send email to support
             self._send_email(self.support_email, email_subject, html_body)
             
-            logger.info(f"Customer inquiry from {customer_email} sent to support")
+            logger.info("Customer inquiry from %s sent to support", customer_email)
             return {
                 "status": "success",
                 "message": f"Your inquiry has been sent to our support team at {self.support_email}",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now.isoformat()
             }
         except Exception as e:
-            logger.error(f"Error sending customer inquiry: {str(e)}")
+            logger.error("Error sending customer inquiry: %s", e)
             return {
                 "status": "error",
                 "message": f"Failed to send inquiry: {str(e)}",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now.isoformat()
             }
 
     def send_aws_optimization_question(self, customer_name: str, customer_email: str,
-                                       question: str, aws_context: str = "") -> Dict[str, Any]:
+                                       question: str, aws_context: str = "",
+                                       wait: bool = False) -> Dict[str, Any]:
         """
         Send AWS optimization question to support
         
@@ -85,168 +264,442 @@ class EmailService:
             customer_email: Customer's email address
             question: The AWS optimization question
             aws_context: Optional AWS context/details
+            wait: Send before returning instead of queueing
         
         Returns:
-            Dictionary with send status
+            Dictionary with send status ("queued" unless wait is set)
         """
+        now = datetime.now()
         try:
+            # Fail now rather than queueing a message the worker cannot send
+            self._check_credentials()
             subject = "AWS Optimization Question"
             
             # Create HTML email body
             html_body = self._create_optimization_question_html(
-                customer_name, customer_email, question, aws_context
+                customer_name, customer_email, question, aws_context,
+                now.strftime(RECEIVED_AT_FORMAT)
             )
             
+            if not wait:
+                self._queue.put((self.support_email, subject, html_body))
+                logger.info("AWS optimization question from %s queued for support", customer_email)
+                return {
+                    "status": "queued",
+                    "message": f"Your question is being sent to our support team at {self.support_email}",
+                    "timestamp": now.isoformat()
+                }
+
             # Send email to support
             self._send_email(self.support_email, subject, html_body)
             
-            logger.info(f"AWS optimization question from {customer_email} sent to support")
+            logger.info("AWS optimization question from %s sent to support", customer_email)
             return {
                 "status": "success",
                 "message": f"Your question has been sent to our support team at {self.support_email}",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now.isoformat()
+            }
+        except Exception as e:
+            logger.error("Error sending optimization question: %s", e)
+            return {
+                "status": "error",
+                "message": f"Failed to send question: {str(e)}",
+                "timestamp": now.isoformat()
+            }
+
+    async def send_customer_inquiry_async(self, customer_name: str, customer_email: str,
+                                          subject: str, message: str) -> Dict[str, Any]:
+        """
+        Send customer inquiry to support without blocking the event loop
+        
+        Args:
+            customer_name: Customer's name
+            customer_email: Customer's email address
+            subject: Subject of the inquiry
+            message: Customer's message/question
+        
+        Returns:
+            Dictionary with send status
+        """
+        now = datetime.now()
+        try:
+            email_subject = f"Customer Inquiry: {subject}"
+            html_body = self._create_inquiry_html(
+                customer_name, customer_email, subject, message,
+                now.strftime(RECEIVED_AT_FORMAT)
+            )
+
+            await self._send_email_async(self.support_email, email_subject, html_body)
+
+            logger.info("Customer inquiry from %s sent to support", customer_email)
+            return {
+                "status": "success",
+                "message": f"Your inquiry has been sent to our support team at {self.support_email}",
+                "timestamp": now.isoformat()
+            }
+        except Exception as e:
+            logger.error("Error sending customer inquiry: %s", e)
+            return {
+                "status": "error",
+                "message": f"Failed to send inquiry: {str(e)}",
+                "timestamp": now.isoformat()
+            }
+
+    async def send_aws_optimization_question_async(self, customer_name: str, customer_email: str,
+                                                   question: str, aws_context: str = "") -> Dict[str, Any]:
+        """
+        Send AWS optimization question to support without blocking the event loop
+        
+        Args:
+            customer_name: Customer's name
+            customer_email: Customer's email address
+            question: The AWS optimization question
+            aws_context: Optional AWS context/details
+        
+        Returns:
+            Dictionary with send status
+        """
+        now = datetime.now()
+        try:
+            subject = "AWS Optimization Question"
+            html_body = self._create_optimization_question_html(
+                customer_name, customer_email, question, aws_context,
+                now.strftime(RECEIVED_AT_FORMAT)
+            )
+
+            await self._send_email_async(self.support_email, subject, html_body)
+
+            logger.info("AWS optimization question from %s sent to support", customer_email)
+            return {
+                "status": "success",
+                "message": f"Your question has been sent to our support team at {self.support_email}",
+                "timestamp": now.isoformat()
             }
         except Exception as e:
-            logger.error(f"Error sending optimization question: {str(e)}")
+            logger.error("Error sending optimization question: %s", e)
             return {
                 "status": "error",
                 "message": f"Failed to send question: {str(e)}",
+                "timestamp": now.isoformat()
+            }
+
+    def _process_queue(self) -> None:
+        """Send queued emails one at a time over the pooled connection"""
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                recipient, subject, html_body = job
+                try:
+                    self._send_email(recipient, subject, html_body)
+                    logger.info("Queued email '%s' sent to %s", subject, recipient)
+                except Exception as e:
+                    logger.error("Error sending queued email '%s': %s", subject, e)
+            finally:
+                self._queue.task_done()
+
+    def shutdown(self, timeout: float = 30.0) -> None:
+        """
+        Send whatever is still queued, then stop the worker and close the connection
+        
+        Args:
+            timeout: Seconds to wait for the queue to drain
+        """
+        if self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join(timeout)
+        self.close()
+
+    def send_batch(self, jobs: Iterable[Tuple[Union[str, Sequence[str]], str, str]]) -> Dict[str, Any]:
+        """
+        Send several distinct emails over one SMTP connection
+        
+        Args:
+            jobs: (recipients, subject, html_body) tuples
+        
+        Returns:
+            Dictionary with send status and sent/failed counts
+        """
+        try:
+            self._check_credentials()
+            messages = [self._build_message(*job) for job in jobs]
+            failed = self._deliver(messages)
+
+            logger.info("Sent batch of %s emails (%s failed)", len(messages) - len(failed), len(failed))
+            return {
+                "status": "success" if not failed else "partial",
+                "sent": len(messages) - len(failed),
+                "failed": failed,
+                "timestamp": datetime.now().isoformat()
+            }
+        except Exception as e:
+            logger.error("Error sending email batch: %s", e)
+            return {
+                "status": "error",
+                "message": f"Failed to send batch: {str(e)}",
                 "timestamp": datetime.now().isoformat()
             }
 
-    def _send_email(self, recipient: str, subject: str, html_body: str) -> None:
+    def _send_email(self, recipients: Union[str, Sequence[str]], subject: str, html_body: str) -> None:
         """
         Internal method to send email via SMTP
         
+        All recipients share one SMTP transaction (one MAIL FROM, one RCPT TO each).
+        
         Args:
-            recipient: Recipient email address
+            recipients: Recipient email address or addresses
             subject: Email subject
             html_body: HTML email body
         
         Raises:
             Exception: If email sending fails
         """
+        self._check_credentials()
+        failed = self._deliver([self._build_message(recipients, subject, html_body)])
+        if failed:
+            raise smtplib.SMTPException(failed[0]["error"])
+
+    def _check_credentials(self) -> None:
+        """Raise if SMTP credentials are missing"""
         if not self.sender_email or not self.sender_password:
             raise Exception("Email credentials not configured. Please set SENDER_EMAIL and SENDER_PASSWORD in .env")
 
-        # Create message
-        message = MIMEMultipart("alternative")
+    def _build_message(self, recipients: Union[str, Sequence[str]], subject: str,
+                       html_body: str) -> Tuple[List[str], str, bytes]:
+        """
+        Build a MIME message
+        
+        Args:
+            recipients: Recipient email address or addresses
+            subject: Email subject
+            html_body: HTML email body
+        
+        Returns:
+            Tuple of (recipient list, subject, message bytes)
+        """
+        if isinstance(recipients, str):
+            recipients = [recipients]
+        else:
+            recipients = list(recipients)
+
+        # The body is the only part, so send it as a single text/html message
+        # rather than wrapping it in a multipart/alternative container
+        message = MIMEText(html_body, "html")
         message["Subject"] = subject
         message["From"] = self.sender_email
-        message["To"] = recipient
+        message["To"] = ", ".join(recipients)
+
+        # Serialize straight to bytes (BytesGenerator into a BytesIO); a str
+        # would only be encoded again by sendmail
+        return recipients, subject, message.as_bytes()
+
+    def _deliver(self, messages: List[Tuple[List[str], str, bytes]]) -> List[Dict[str, Any]]:
+        """
+        Send built messages over the pooled connection
+        
+        A message the server rejects is recorded and the rest still go out; a
+        dropped connection is re-opened once per message.
+        
+        Args:
+            messages: Output of _build_message
+        
+        Returns:
+            List of failures with subject and error
+        """
+        failed = []
+        with self._smtp_lock:
+            try:
+                server = self._get_connection()
+                for recipients, subject, body in messages:
+                    try:
+                        try:
+                            server.sendmail(self.sender_email, recipients, body)
+                        except smtplib.SMTPServerDisconnected:
+                            self._close_connection()
+                            server = self._get_connection()
+                            server.sendmail(self.sender_email, recipients, body)
+                    except (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError) as e:
+                        failed.append({"subject": subject, "recipients": recipients, "error": str(e)})
+                self._smtp_last_used = time.monotonic()
+            except (smtplib.SMTPException, OSError):
+                self._close_connection()
+                raise
+        return failed
+
+    def _get_connection(self) -> smtplib.SMTP:
+        """
+        Return a live, authenticated SMTP connection (caller holds _smtp_lock)
+        
+        Returns:
+            Connected smtplib.SMTP instance
+        """
+        server = self._smtp
+        if server is not None and time.monotonic() - self._smtp_last_used < SMTP_IDLE_TIMEOUT:
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except (smtplib.SMTPException, OSError):
+                pass
+
+        self._close_connection()
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        server.starttls(context=self._tls_context)
+        server.login(self.sender_email, self.sender_password)
+
+        # TLS 1.3 tickets arrive after the handshake, so save the session once login has read data
+        if server.sock.session is not None:
+            self._tls_context.session = server.sock.session
+        logger.debug("SMTP TLS session reused: %s", server.sock.session_reused)
+
+        self._smtp = server
+        self._smtp_last_used = time.monotonic()
+        return server
+
+    def _close_connection(self) -> None:
+        """Quit and forget the pooled SMTP connection"""
+        server, self._smtp = self._smtp, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    def close(self) -> None:
+        """Close the pooled SMTP connection"""
+        with self._smtp_lock:
+            self._close_connection()
+
+    async def _send_email_async(self, recipients: Union[str, Sequence[str]], subject: str,
+                                html_body: str) -> None:
+        """
+        Send an email over the pooled aiosmtplib connection
+        
+        Concurrent callers share one SMTP session; the lock keeps their
+        transactions from interleaving on it.
+        
+        Args:
+            recipients: Recipient email address or addresses
+            subject: Email subject
+            html_body: HTML email body
+        
+        Raises:
+            Exception: If aiosmtplib is missing or the email cannot be sent
+        """
+        if not AIOSMTPLIB_AVAILABLE:
+            raise Exception("aiosmtplib is not installed; use the synchronous send methods")
+        self._check_credentials()
+        recipients, subject, body = self._build_message(recipients, subject, html_body)
+
+        pool = self._async_pool()
+        async with pool.lock:
+            try:
+                server = await self._get_async_connection(pool)
+                try:
+                    await server.sendmail(self.sender_email, recipients, body)
+                except aiosmtplib.SMTPServerDisconnected:
+                    await self._close_async_connection(pool)
+                    server = await self._get_async_connection(pool)
+                    await server.sendmail(self.sender_email, recipients, body)
+                pool.last_used = time.monotonic()
+            except (aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPSenderRefused,
+                    aiosmtplib.SMTPDataError):
+                # Only this message was refused; the session is still usable
+                raise
+            except (aiosmtplib.SMTPException, OSError):
+                await self._close_async_connection(pool)
+                raise
+
+    def _async_pool(self) -> _AsyncSMTPPool:
+        """
+        Return the aiosmtplib pool of the running event loop, creating it if needed
+        
+        Returns:
+            Pool owned by the running loop
+        """
+        loop = asyncio.get_running_loop()
+        with self._async_pools_lock:
+            # Pools of finished loops (e.g. earlier asyncio.run calls) can never be used again
+            for closed in [other for other in self._async_pools if other.is_closed()]:
+                del self._async_pools[closed]
+            pool = self._async_pools.get(loop)
+            if pool is None:
+                pool = self._async_pools[loop] = _AsyncSMTPPool()
+        return pool
+
+    async def _get_async_connection(self, pool: _AsyncSMTPPool) -> "aiosmtplib.SMTP":
+        """
+        Return a live, authenticated aiosmtplib connection (caller holds pool.lock)
+        
+        Args:
+            pool: Pool of the running event loop
+        
+        Returns:
+            Connected aiosmtplib.SMTP instance
+        """
+        server = pool.server
+        if server is not None and server.is_connected and \
+                time.monotonic() - pool.last_used < SMTP_IDLE_TIMEOUT:
+            try:
+                if (await server.noop()).code == 250:
+                    return server
+            except (aiosmtplib.SMTPException, OSError):
+                pass
 
-        # Attach HTML body
-        part = MIMEText(html_body, "html")
-        message.attach(part)
+        await self._close_async_connection(pool)
+        server = aiosmtplib.SMTP(hostname=self.smtp_server, port=self.smtp_port,
+                                 start_tls=True, tls_context=self._tls_context)
+        await server.connect()
+        await server.login(self.sender_email, self.sender_password)
 
-        # Send email
-        with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-            server.starttls()
-            server.login(self.sender_email, self.sender_password)
-            server.sendmail(self.sender_email, recipient, message.as_string())
+        pool.server = server
+        pool.last_used = time.monotonic()
+        return server
+
+    async def _close_async_connection(self, pool: _AsyncSMTPPool) -> None:
+        """Quit and forget a pooled aiosmtplib connection"""
+        server, pool.server = pool.server, None
+        if server is None:
+            return
+        try:
+            await server.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            server.close()
+
+    async def aclose(self) -> None:
+        """Close the running event loop's pooled aiosmtplib connection"""
+        with self._async_pools_lock:
+            pool = self._async_pools.pop(asyncio.get_running_loop(), None)
+        if pool is None:
+            return
+        async with pool.lock:
+            await self._close_async_connection(pool)
 
     def _create_inquiry_html(self, customer_name: str, customer_email: str,
-                            subject: str, message: str) -> str:
+                            subject: str, message: str, timestamp: str) -> str:
         """Create HTML for customer inquiry email"""
-        return f"""
-        <html>
-            <head>
-                <style>
-                    body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                    .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                    .header {{ background-color: #FF9900; color: white; padding: 20px; border-radius: 5px; }}
-                    .customer-info {{ background-color: #f9f9f9; padding: 15px; margin: 15px 0; border-radius: 5px; border-left: 4px solid #FF9900; }}
-                    .message-box {{ background-color: #f0f8f0; padding: 15px; margin: 15px 0; border-radius: 5px; }}
-                    .footer {{ text-align: center; color: #666; font-size: 12px; margin-top: 20px; }}
-                    h1 {{ color: #FF9900; }}
-                    h3 {{ color: #333; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="header">
-                        <h1>New Customer Inquiry</h1>
-                        <p>Received: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-                    </div>
-                    
-                    <div class="customer-info">
-                        <h3>Customer Information:</h3>
-                        <p><strong>Name:</strong> {customer_name}</p>
-                        <p><strong>Email:</strong> {customer_email}</p>
-                        <p><strong>Subject:</strong> {subject}</p>
-                    </div>
-                    
-                    <div class="message-box">
-                        <h3>Message:</h3>
-                        <p>{message}</p>
-                    </div>
-                    
-                    <p><strong>Action Required:</strong> Please respond to this customer at {customer_email}</p>
-                    
-                    <div class="footer">
-                        <p>FinOps Chatbot - Customer Support System</p>
-                    </div>
-                </div>
-            </body>
-        </html>
-        """
+        prefix, suffix = _INQUIRY_SHELL
+        return "".join((prefix, _INQUIRY_TEMPLATE.render(
+            customer_name=customer_name,
+            customer_email=customer_email,
+            subject=subject,
+            message=message,
+            received_at=timestamp,
+        ), suffix))
 
     def _create_optimization_question_html(self, customer_name: str, customer_email: str,
-                                          question: str, aws_context: str = "") -> str:
+                                          question: str, aws_context: str,
+                                          timestamp: str) -> str:
         """Create HTML for AWS optimization question email"""
-        context_section = ""
-        if aws_context:
-            context_section = f"""
-            <div class="context-box">
-                <h3>AWS Context:</h3>
-                <p>{aws_context}</p>
-            </div>
-            """
-
-        return f"""
-        <html>
-            <head>
-                <style>
-                    body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                    .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                    .header {{ background-color: #FF9900; color: white; padding: 20px; border-radius: 5px; }}
-                    .customer-info {{ background-color: #f9f9f9; padding: 15px; margin: 15px 0; border-radius: 5px; border-left: 4px solid #FF9900; }}
-                    .question-box {{ background-color: #e8f4f8; padding: 15px; margin: 15px 0; border-radius: 5px; }}
-                    .context-box {{ background-color: #fff3cd; padding: 15px; margin: 15px 0; border-radius: 5px; }}
-                    .footer {{ text-align: center; color: #666; font-size: 12px; margin-top: 20px; }}
-                    h1 {{ color: #FF9900; }}
-                    h3 {{ color: #333; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="header">
-                        <h1>AWS Optimization Question</h1>
-                        <p>Received: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-                    </div>
-                    
-                    <div class="customer-info">
-                        <h3>Customer Information:</h3>
-                        <p><strong>Name:</strong> {customer_name}</p>
-                        <p><strong>Email:</strong> {customer_email}</p>
-                    </div>
-                    
-                    <div class="question-box">
-                        <h3>Question:</h3>
-                        <p>{question}</p>
-                    </div>
-                    
-                    {context_section}
-                    
-                    <p><strong>Action Required:</strong> Please provide AWS optimization recommendations and respond to {customer_email}</p>
-                    
-                    <div class="footer">
-                        <p>FinOps Chatbot - Customer Support System</p>
-                    </div>
-                </div>
-            </body>
-        </html>
-        """
+        prefix, suffix = _OPTIMIZATION_QUESTION_SHELL
+        return "".join((prefix, _OPTIMIZATION_QUESTION_TEMPLATE.render(
+            customer_name=customer_name,
+            customer_email=customer_email,
+            question=question,
+            aws_context=aws_context,
+            received_at=timestamp,
+        ), suffix))
 
 
 def main():
@@ -260,7 +713,8 @@ def main():
         customer_name="fathi",
         customer_email="fathi.maddeh.it@gmail.com",
         subject="How to optimize my EC2 costs",
-        message="I have 50 EC2 instances running and want to reduce costs. What are the best practices?"
+        message="I have 50 EC2 instances running and want to reduce costs. What are the best practices?",
+        wait=True
     )
     
     print(f"Test result: {test_result}")
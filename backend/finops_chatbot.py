@@ -5,8 +5,12 @@ Orchestrates AWS data extraction, storage, and AI-powered optimization insights
 
 import logging
 import os
-from typing import Dict, Any, List
+import sys
+import threading
+from typing import Dict, Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import cached_property, lru_cache
 from dotenv import load_dotenv
 
 from aws_cost_extractor import AWSCostExtractor
@@ -19,35 +23,124 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Load environment variables
+# Load environment variables once at import rather than per chatbot instance
 load_dotenv()
+AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
+MISTRAL_API_KEY = os.getenv("MISTRAL_API_KEY", "")
+CHROMADB_PATH = os.getenv("CHROMADB_PATH", "./data/chromadb")
+
+# Insights included in query context and the summary
+TOP_INSIGHTS_COUNT = 5
+
+# Answer given without calling the AI engine when nothing has been synced yet
+NO_DATA_RESPONSE = "No AWS data available. Please sync your account first using POST /api/sync."
+
+# Shared by all chatbots for background vector store writes, so syncs do not
+# pay for starting threads
+_store_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="vector-store")
+
+
+# Serializes first construction so concurrent requests never build a component twice
+_components_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _shared_cost_extractor(region: str) -> AWSCostExtractor:
+    """Build (once per process and region) the AWS cost extractor"""
+    extractor = AWSCostExtractor(region=region)
+    logger.info("AWS Cost Extractor initialized")
+    return extractor
+
+
+@lru_cache(maxsize=None)
+def _shared_vector_store(persist_directory: str) -> ChromaDBStore:
+    """Build (once per process and directory) the ChromaDB vector store"""
+    store = ChromaDBStore(persist_directory=persist_directory)
+    logger.info("ChromaDB Vector Store initialized")
+    return store
+
+
+@lru_cache(maxsize=None)
+def _shared_ai_engine(api_key: str) -> MistralAIEngine:
+    """Build (once per process and API key) the Mistral AI engine"""
+    engine = MistralAIEngine(api_key=api_key)
+    logger.info("Mistral AI Engine initialized")
+    return engine
 
 
 class FinOpsChatbot:
     """Main FinOps Chatbot orchestrator"""
 
-    def __init__(self):
-        """Initialize the FinOps Chatbot"""
-        self.aws_region = os.getenv("AWS_REGION", "us-east-1")
-        self.mistral_api_key = os.getenv("MISTRAL_API_KEY", "")
-        self.chromadb_path = os.getenv("CHROMADB_PATH", "./data/chromadb")
+    def __init__(self, db_manager=None):
+        """
+        Initialize the FinOps Chatbot
+        
+        Args:
+            db_manager: Optional DatabaseManager that synced cost records are persisted to
+        """
+        self.db_manager = db_manager
+        self.aws_region = AWS_REGION
+        self.mistral_api_key = MISTRAL_API_KEY
+        self.chromadb_path = CHROMADB_PATH
+
+        # Components are built on first use (see the properties below)
+        self._set_insights([])
+        logger.info("FinOps Chatbot initialized successfully")
 
-        # Initialize components
+    @cached_property
+    def cost_extractor(self) -> Optional[AWSCostExtractor]:
+        """AWS cost extractor, or None when it cannot be initialized"""
         try:
-            self.cost_extractor = AWSCostExtractor(region=self.aws_region)
-            logger.info("AWS Cost Extractor initialized")
+            with _components_lock:
+                return _shared_cost_extractor(self.aws_region)
         except Exception as e:
-            logger.warning(f"AWS Cost Extractor initialization failed: {str(e)}")
-            self.cost_extractor = None
-
-        self.vector_store = ChromaDBStore(persist_directory=self.chromadb_path)
-        logger.info("ChromaDB Vector Store initialized")
-
-        self.ai_engine = MistralAIEngine(api_key=self.mistral_api_key)
-        logger.info("Mistral AI Engine initialized")
+            logger.warning("AWS Cost Extractor initialization failed: %s", e)
+            return None
+
+    @cached_property
+    def vector_store(self) -> ChromaDBStore:
+        """ChromaDB vector store, shared by every chatbot using the same path"""
+        with _components_lock:
+            return _shared_vector_store(self.chromadb_path)
+
+    @cached_property
+    def ai_engine(self) -> MistralAIEngine:
+        """Mistral AI engine, shared by every chatbot using the same API key"""
+        with _components_lock:
+            return _shared_ai_engine(self.mistral_api_key)
+
+    def _set_insights(self, insights: List[Dict[str, Any]]) -> None:
+        """
+        Replace the current insights and cache their total potential savings
+        and the top few (as a tuple, so callers can share it)
+        
+        Args:
+            insights: Optimization insights
+        """
+        self.optimization_insights = insights
+        self._total_savings = sum(i.get("potential_savings", 0) for i in insights)
+        self._top_insights = tuple(insights[:TOP_INSIGHTS_COUNT])
 
-        self.optimization_insights = []
-        logger.info("FinOps Chatbot initialized successfully")
+    def _search_all(self, query_norm: str) -> Tuple[List[Dict[str, Any]], ...]:
+        """
+        Run the cost, resource and optimization searches for a query
+        
+        Results are cached by the vector store for CACHE_TTL seconds and
+        dropped whenever the stored data changes.
+        
+        Args:
+            query_norm: Stripped, lower-cased user query
+        
+        Returns:
+            Tuple of (cost_data, resource_data, optimization_data)
+        """
+        # One batched store call embeds the query once for all three kinds
+        return self.vector_store.search_all_kinds(
+            query_norm,
+            cost_limit=100,
+            resource_limit=100,
+            optimization_limit=50,
+        )
 
     def sync_aws_data(self, days: int = 30) -> Dict[str, Any]:
         """
@@ -64,24 +157,40 @@ class FinOpsChatbot:
             return {"status": "error", "message": "AWS credentials not configured"}
 
         try:
-            logger.info(f"Starting AWS data sync for {days} days")
+            logger.info("Starting AWS data sync for %s days", days)
 
             # Extract AWS data
             optimization_data = self.cost_extractor.generate_optimization_data(days=days)
 
-            # Store in ChromaDB (these methods now handle empty data gracefully)
-            self.vector_store.add_cost_data(optimization_data.get("service_breakdown", []))
-            self.vector_store.add_resource_data(optimization_data.get("ec2_instances", []))
-
-            # Generate optimization insights
-            self.optimization_insights = self.ai_engine.generate_optimization_insights(
-                cost_data=optimization_data.get("service_breakdown", []),
-                resource_data=optimization_data.get("ec2_instances", []),
-                unused_resources=optimization_data.get("unused_resources", {})
-            )
-
-            # Store insights (this method now handles empty data gracefully)
-            self.vector_store.add_optimization_insights(self.optimization_insights)
+            # Store in ChromaDB (these methods now handle empty data gracefully).
+            # The record kinds are independent, so the cost and resource writes
+            # run in the background while the insights are generated.
+            store = self.vector_store
+            writes = [
+                _store_pool.submit(store.add_cost_data, optimization_data.get("service_breakdown", [])),
+                _store_pool.submit(store.add_resource_data, optimization_data.get("ec2_instances", [])),
+            ]
+            if self.db_manager is not None:
+                # Rows already stored for a service, region and day are skipped
+                writes.append(_store_pool.submit(
+                    self.db_manager.add_cost_records_bulk, optimization_data.get("service_breakdown", [])
+                ))
+
+            try:
+                # Generate optimization insights
+                self._set_insights(self.ai_engine.generate_optimization_insights(
+                    cost_data=optimization_data.get("service_breakdown", []),
+                    resource_data=optimization_data.get("ec2_instances", []),
+                    unused_resources=optimization_data.get("unused_resources", {})
+                ))
+
+                # Store insights (this method now handles empty data gracefully)
+                store.add_optimization_insights(self.optimization_insights)
+            finally:
+                # Re-raise write errors, and never report while a write is
+                # still running
+                for write in writes:
+                    write.result()
 
             result = {
                 "status": "success",
@@ -91,11 +200,11 @@ class FinOpsChatbot:
                 "timestamp": datetime.now().isoformat(),
             }
 
-            logger.info(f"AWS data sync completed: {result}")
+            logger.info("AWS data sync completed: %s", result)
             return result
 
         except Exception as e:
-            logger.error(f"Error syncing AWS data: {str(e)}")
+            logger.error("Error syncing AWS data: %s", e)
             return {"status": "error", "message": str(e)}
 
     def query(self, user_query: str) -> Dict[str, Any]:
@@ -109,22 +218,34 @@ class FinOpsChatbot:
             Dictionary with response and relevant data
         """
         try:
-            logger.info(f"Processing query: {user_query}")
+            logger.info("Processing query: %s", user_query)
 
             # Retrieve ALL actual AWS data from vector store (not just search results)
-            # This ensures we always get the data, not just search matches
-            cost_data = self.vector_store.search_costs(user_query, limit=100)
-            resource_data = self.vector_store.search_resources(user_query, limit=100)
-            optimization_data = self.vector_store.search_optimizations(user_query, limit=50)
-
-            logger.info(f"Retrieved {len(cost_data)} costs, {len(resource_data)} resources, {len(optimization_data)} optimizations")
+            # This ensures we always get the data, not just search matches.
+            # Repeated queries are served from the cache until the data changes.
+            cost_data, resource_data, optimization_data = self._search_all(user_query.strip().lower())
+
+            logger.info("Retrieved %s costs, %s resources, %s optimizations", len(cost_data), len(resource_data), len(optimization_data))
+
+            # Nothing to ground an answer in; skip the (paid) Mistral round-trip
+            if not (cost_data or resource_data or optimization_data or self.optimization_insights):
+                logger.info("No AWS data available, skipping AI engine")
+                return {
+                    "status": "success",
+                    "query": user_query,
+                    "response": NO_DATA_RESPONSE,
+                    "relevant_costs": [],
+                    "relevant_resources": [],
+                    "relevant_optimizations": [],
+                    "timestamp": datetime.now().isoformat(),
+                }
 
             # Build context with real data
             context = {
                 "costs": cost_data,
                 "resources": resource_data,
                 "optimizations": optimization_data,
-                "insights": self.optimization_insights[:5],
+                "insights": self._top_insights,
             }
 
             # Generate AI response with actual data
@@ -140,11 +261,11 @@ class FinOpsChatbot:
                 "timestamp": datetime.now().isoformat(),
             }
 
-            logger.info(f"Query processed successfully with {len(cost_data)} costs and {len(resource_data)} resources")
+            logger.info("Query processed successfully with %s costs and %s resources", len(cost_data), len(resource_data))
             return result
 
         except Exception as e:
-            logger.error(f"Error processing query: {str(e)}")
+            logger.error("Error processing query: %s", e)
             return {
                 "status": "error",
                 "query": user_query,
@@ -167,7 +288,7 @@ class FinOpsChatbot:
             report = self.ai_engine.generate_report(self.optimization_insights)
             return report
         except Exception as e:
-            logger.error(f"Error generating report: {str(e)}")
+            logger.error("Error generating report: %s", e)
             return "Error generating report"
 
     def get_summary(self) -> Dict[str, Any]:
@@ -180,22 +301,18 @@ class FinOpsChatbot:
         try:
             stats = self.vector_store.get_collection_stats()
 
-            total_potential_savings = sum(
-                i.get("potential_savings", 0) for i in self.optimization_insights
-            )
-
             summary = {
                 "status": "active",
                 "collection_stats": stats,
                 "total_insights": len(self.optimization_insights),
-                "total_potential_savings": total_potential_savings,
-                "top_insights": self.optimization_insights[:5],
+                "total_potential_savings": self._total_savings,
+                "top_insights": self._top_insights,
                 "timestamp": datetime.now().isoformat(),
             }
 
             return summary
         except Exception as e:
-            logger.error(f"Error getting summary: {str(e)}")
+            logger.error("Error getting summary: %s", e)
             return {"status": "error", "message": str(e)}
 
     def clear_data(self) -> Dict[str, Any]:
@@ -207,11 +324,11 @@ class FinOpsChatbot:
         """
         try:
             self.vector_store.clear_collections()
-            self.optimization_insights = []
+            self._set_insights([])
             logger.info("All data cleared")
             return {"status": "success", "message": "All data cleared"}
         except Exception as e:
-            logger.error(f"Error clearing data: {str(e)}")
+            logger.error("Error clearing data: %s", e)
             return {"status": "error", "message": str(e)}
 
 
@@ -243,10 +360,13 @@ def main():
         "What are the top cost optimization opportunities?",
     ]
 
+    # Collect the answers and write them in one go instead of once per line
+    output = []
     for query in example_queries:
-        print(f"Query: {query}")
         response = chatbot.query(query)
-        print(f"Response: {response['response']}\n")
+        output.append(f"Query: {query}\nResponse: {response['response']}\n\n")
+    sys.stdout.write("".join(output))
+    sys.stdout.flush()
 
     # Generate report
     print("Generating optimization report...")
@@ -9,20 +9,40 @@ from datetime import datetime
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Canned responses, checked in order; the first keyword found in the query wins
+RESPONSES = (
+    ("cost", "Based on your AWS usage, I recommend implementing Reserved Instances for your top services, which could save 30-40% on compute costs."),
+    ("optimization", "To optimize your AWS spending, focus on: 1) Right-sizing instances, 2) Implementing auto-scaling, 3) Using spot instances for non-critical workloads."),
+    ("savings", "By implementing the recommended optimizations, you could potentially save 25-35% on your monthly AWS bill."),
+    ("ec2", "EC2 is often the largest cost driver. Consider: 1) Using Reserved Instances for predictable workloads, 2) Spot Instances for flexible workloads, 3) Right-sizing your instances."),
+    ("unused", "Unused resources are costing you money. Regularly audit and terminate: 1) Stopped instances, 2) Unattached volumes, 3) Unused Elastic IPs."),
+)
+DEFAULT_RESPONSE = "I can help you optimize your AWS costs. Ask me about specific services, cost patterns, or optimization strategies."
+
 
 class FinOpsChatbot:
     """Simplified FinOps Chatbot"""
 
     def __init__(self):
         """Initialize the FinOps Chatbot"""
-        self.optimization_insights = []
+        self._set_insights([])
         logger.info("FinOps Chatbot initialized successfully")
 
+    def _set_insights(self, insights: List[Dict[str, Any]]) -> None:
+        """
+        Replace the current insights and cache their total potential savings
+        
+        Args:
+            insights: Optimization insights
+        """
+        self.optimization_insights = insights
+        self._total_savings = sum(i.get("potential_savings", 0) for i in insights)
+
     def sync_aws_data(self, days: int = 30) -> Dict[str, Any]:
         """Sync AWS data"""
         try:
             # Generate demo insights
-            self.optimization_insights = [
+            self._set_insights([
                 {
                     "title": "High spending on Amazon EC2",
                     "description": "EC2 is your highest cost driver",
@@ -47,7 +67,7 @@ class FinOpsChatbot:
                     "category": "Architecture Optimization",
                     "recommendation": "Consolidate resources to fewer regions"
                 }
-            ]
+            ])
 
             return {
                 "status": "success",
@@ -66,20 +86,11 @@ class FinOpsChatbot:
             logger.info(f"Processing query: {user_query}")
 
             # Generate response based on query
-            responses = {
-                "cost": "Based on your AWS usage, I recommend implementing Reserved Instances for your top services, which could save 30-40% on compute costs.",
-                "optimization": "To optimize your AWS spending, focus on: 1) Right-sizing instances, 2) Implementing auto-scaling, 3) Using spot instances for non-critical workloads.",
-                "savings": "By implementing the recommended optimizations, you could potentially save 25-35% on your monthly AWS bill.",
-                "ec2": "EC2 is often the largest cost driver. Consider: 1) Using Reserved Instances for predictable workloads, 2) Spot Instances for flexible workloads, 3) Right-sizing your instances.",
-                "unused": "Unused resources are costing you money. Regularly audit and terminate: 1) Stopped instances, 2) Unattached volumes, 3) Unused Elastic IPs.",
-                "default": "I can help you optimize your AWS costs. Ask me about specific services, cost patterns, or optimization strategies."
-            }
-
             query_lower = user_query.lower()
-            response = responses["default"]
-            
-            for key, value in responses.items():
-                if key in query_lower:
+            response = DEFAULT_RESPONSE
+
+            for keyword, value in RESPONSES:
+                if keyword in query_lower:
                     response = value
                     break
 
@@ -97,7 +108,7 @@ class FinOpsChatbot:
             return {
                 "status": "success",
                 "query": user_query,
-                "response": "I can help you optimize your AWS costs. Ask me about specific services, cost patterns, or optimization strategies.",
+                "response": DEFAULT_RESPONSE,
                 "relevant_costs": [],
                 "relevant_resources": [],
                 "relevant_optimizations": [],
@@ -107,23 +118,25 @@ class FinOpsChatbot:
     def get_optimization_report(self) -> str:
         """Generate optimization report"""
         try:
-            report = "# AWS FinOps Optimization Report\n\n"
-            report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-            report += f"## Summary\n"
-            
-            total_savings = sum(i.get("potential_savings", 0) for i in self.optimization_insights)
-            report += f"Total Potential Savings: ${total_savings:.2f}\n"
-            report += f"Total Insights: {len(self.optimization_insights)}\n\n"
-
-            report += "## Recommendations\n"
+            parts = [
+                "# AWS FinOps Optimization Report\n\n",
+                f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+                "## Summary\n",
+                f"Total Potential Savings: ${self._total_savings:.2f}\n",
+                f"Total Insights: {len(self.optimization_insights)}\n\n",
+                "## Recommendations\n",
+            ]
+            append = parts.append
             for insight in self.optimization_insights:
-                report += f"### {insight.get('title')}\n"
-                report += f"- Description: {insight.get('description')}\n"
-                report += f"- Potential Savings: ${insight.get('potential_savings', 0):.2f}\n"
-                report += f"- Priority: {insight.get('priority')}\n"
-                report += f"- Recommendation: {insight.get('recommendation')}\n\n"
-
-            return report
+                append(
+                    f"### {insight.get('title')}\n"
+                    f"- Description: {insight.get('description')}\n"
+                    f"- Potential Savings: ${insight.get('potential_savings', 0):.2f}\n"
+                    f"- Priority: {insight.get('priority')}\n"
+                    f"- Recommendation: {insight.get('recommendation')}\n\n"
+                )
+
+            return "".join(parts)
         except Exception as e:
             logger.error(f"Error generating report: {str(e)}")
             return "Error generating report"
@@ -131,8 +144,6 @@ class FinOpsChatbot:
     def get_summary(self) -> Dict[str, Any]:
         """Get summary"""
         try:
-            total_savings = sum(i.get("potential_savings", 0) for i in self.optimization_insights)
-            
             return {
                 "status": "active",
                 "collection_stats": {
@@ -141,7 +152,7 @@ class FinOpsChatbot:
                     "optimization_records": len(self.optimization_insights)
                 },
                 "total_insights": len(self.optimization_insights),
-                "total_potential_savings": total_savings,
+                "total_potential_savings": self._total_savings,
                 "top_insights": self.optimization_insights[:5],
                 "timestamp": datetime.now().isoformat(),
             }
@@ -152,7 +163,7 @@ class FinOpsChatbot:
     def clear_data(self) -> Dict[str, Any]:
         """Clear data"""
         try:
-            self.optimization_insights = []
+            self._set_insights([])
             logger.info("All data cleared")
             return {"status": "success", "message": "All data cleared"}
         except Exception as e:
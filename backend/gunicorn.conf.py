@@ -0,0 +1,24 @@
+"""
+Gunicorn Configuration
+Production WSGI settings for the FinOps Chatbot API
+
+Usage:
+    gunicorn -c gunicorn.conf.py app:app
+"""
+
+import os
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', 5000)}"
+
+# The chatbot keeps insights and the sync scheduler in process memory, so a
+# single worker is used and concurrency comes from threads. pandas, numpy and
+# scikit-learn release the GIL in their heavy loops, so analytics requests
+# still run in parallel across cores.
+workers = 1
+worker_class = "gthread"
+threads = int(os.getenv("WSGI_THREADS", 8))
+timeout = int(os.getenv("WSGI_TIMEOUT", 120))
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "INFO").lower()
@@ -0,0 +1,88 @@
+"""
+JSON Provider Module
+Flask JSON provider backed by orjson for faster API responses
+"""
+
+import datetime
+import decimal
+import logging
+from typing import Any, Union
+
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def _default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively"""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _iso_default(obj: Any) -> Any:
+    """Encode dates as ISO 8601 like orjson, then defer to Flask's defaults"""
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    return DefaultJSONProvider.default(obj)
+
+
+class ISOJSONProvider(DefaultJSONProvider):
+    """
+    Standard library provider used when orjson is missing
+
+    Flask's default encodes datetimes as HTTP dates; this keeps the ISO 8601
+    format the orjson provider produces, so model to_dict() output looks the
+    same either way.
+    """
+
+    default = staticmethod(_iso_default)
+
+
+class ORJSONProvider(JSONProvider):
+    """
+    Serialize responses with orjson
+
+    numpy scalars and arrays are encoded natively, so analytics results do
+    not need per-value float() casts before being returned from a route.
+    """
+
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if ORJSON_AVAILABLE else 0
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data as a JSON string"""
+        return orjson.dumps(obj, default=kwargs.get("default", _default), option=self.option).decode()
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """Deserialize data from a JSON string or bytes"""
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        """Serialize the arguments straight to a bytes response body"""
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=self.option)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json_provider(app) -> None:
+    """
+    Use the orjson provider for the app when orjson is installed
+
+    Args:
+        app: Flask application
+    """
+    if ORJSON_AVAILABLE:
+        app.json = ORJSONProvider(app)
+        logger.info("Using orjson JSON provider")
+    else:
+        app.json = ISOJSONProvider(app)
+        logger.warning("orjson not installed, using standard library JSON provider")
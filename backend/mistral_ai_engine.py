@@ -19,6 +19,17 @@ except ImportError as e:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Canned answers used without the Mistral API, checked in order; the first
+# keyword found in the query wins
+FALLBACK_RESPONSES = (
+    ("cost", "Based on your AWS usage, I recommend implementing Reserved Instances for your top services, which could save 30-40% on compute costs."),
+    ("optimization", "To optimize your AWS spending, focus on: 1) Right-sizing instances, 2) Implementing auto-scaling, 3) Using spot instances for non-critical workloads."),
+    ("savings", "By implementing the recommended optimizations, you could potentially save 25-35% on your monthly AWS bill."),
+    ("ec2", "EC2 is often the largest cost driver. Consider: 1) Using Reserved Instances for predictable workloads, 2) Spot Instances for flexible workloads, 3) Right-sizing your instances."),
+    ("unused", "Unused resources are costing you money. Regularly audit and terminate: 1) Stopped instances, 2) Unattached volumes, 3) Unused Elastic IPs."),
+)
+DEFAULT_FALLBACK_RESPONSE = "I can help you optimize your AWS costs. Ask me about specific services, cost patterns, or optimization strategies."
+
 
 class MistralAIEngine:
     """Generate AI-powered optimization insights using Mistral AI"""
@@ -317,7 +328,7 @@ class MistralAIEngine:
             context_parts.append(f"Running Resources:\n{resources_str}")
 
         # Add optimization insights
-        if "insights" in context and isinstance(context["insights"], list) and len(context["insights"]) > 0:
+        if "insights" in context and isinstance(context["insights"], (list, tuple)) and len(context["insights"]) > 0:
             insights_str = "\n".join(
                 [f"- {i.get('title', 'Unknown')}: {i.get('description', '')} (Potential savings: ${i.get('potential_savings', 0):.2f})" 
                  for i in context["insights"][:3]]
@@ -424,7 +435,7 @@ Keep your answer brief and actionable (2-3 sentences)."""
             insights = context.get("insights", [])
             
             if optimizations or insights:
-                items = optimizations + insights
+                items = [*optimizations, *insights]
                 if items:
                     top_item = items[0]
                     savings = top_item.get('savings') or top_item.get('potential_savings', 0)
@@ -458,21 +469,12 @@ Keep your answer brief and actionable (2-3 sentences)."""
         Returns:
             Fallback response
         """
-        fallback_responses = {
-            "cost": "Based on your AWS usage, I recommend implementing Reserved Instances for your top services, which could save 30-40% on compute costs.",
-            "optimization": "To optimize your AWS spending, focus on: 1) Right-sizing instances, 2) Implementing auto-scaling, 3) Using spot instances for non-critical workloads.",
-            "savings": "By implementing the recommended optimizations, you could potentially save 25-35% on your monthly AWS bill.",
-            "ec2": "EC2 is often the largest cost driver. Consider: 1) Using Reserved Instances for predictable workloads, 2) Spot Instances for flexible workloads, 3) Right-sizing your instances.",
-            "unused": "Unused resources are costing you money. Regularly audit and terminate: 1) Stopped instances, 2) Unattached volumes, 3) Unused Elastic IPs.",
-            "default": "I can help you optimize your AWS costs. Ask me about specific services, cost patterns, or optimization strategies."
-        }
-
         query_lower = query.lower()
-        for key, response in fallback_responses.items():
-            if key in query_lower:
+        for keyword, response in FALLBACK_RESPONSES:
+            if keyword in query_lower:
                 return response
 
-        return fallback_responses["default"]
+        return DEFAULT_FALLBACK_RESPONSE
 
     def generate_report(self, insights: List[Dict[str, Any]]) -> str:
         """
@@ -484,34 +486,46 @@ Keep your answer brief and actionable (2-3 sentences)."""
         Returns:
             Formatted report string
         """
-        report = "# AWS FinOps Optimization Report\n\n"
-        report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-
-        # Group insights by priority
-        high_priority = [i for i in insights if i.get("priority") == "High"]
-        medium_priority = [i for i in insights if i.get("priority") == "Medium"]
-        low_priority = [i for i in insights if i.get("priority") == "Low"]
-
-        total_savings = sum(i.get("potential_savings", 0) for i in insights)
-        report += f"## Summary\n"
-        report += f"Total Potential Savings: ${total_savings:.2f}\n"
-        report += f"Total Insights: {len(insights)}\n\n"
+        # Group insights by priority and sum the savings in one pass
+        high_priority = []
+        medium_priority = []
+        total_savings = 0
+        for insight in insights:
+            total_savings += insight.get("potential_savings", 0)
+            priority = insight.get("priority")
+            if priority == "High":
+                high_priority.append(insight)
+            elif priority == "Medium":
+                medium_priority.append(insight)
+
+        parts = [
+            "# AWS FinOps Optimization Report\n\n",
+            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+            "## Summary\n",
+            f"Total Potential Savings: ${total_savings:.2f}\n",
+            f"Total Insights: {len(insights)}\n\n",
+        ]
+        append = parts.append
 
         # High priority insights
         if high_priority:
-            report += "## High Priority Actions\n"
+            append("## High Priority Actions\n")
             for insight in high_priority:
-                report += f"### {insight.get('title')}\n"
-                report += f"- Description: {insight.get('description')}\n"
-                report += f"- Potential Savings: ${insight.get('potential_savings', 0):.2f}\n"
-                report += f"- Recommendation: {insight.get('recommendation')}\n\n"
+                append(
+                    f"### {insight.get('title')}\n"
+                    f"- Description: {insight.get('description')}\n"
+                    f"- Potential Savings: ${insight.get('potential_savings', 0):.2f}\n"
+                    f"- Recommendation: {insight.get('recommendation')}\n\n"
+                )
 
         # Medium priority insights
         if medium_priority:
-            report += "## Medium Priority Actions\n"
+            append("## Medium Priority Actions\n")
             for insight in medium_priority:
-                report += f"### {insight.get('title')}\n"
-                report += f"- Description: {insight.get('description')}\n"
-                report += f"- Potential Savings: ${insight.get('potential_savings', 0):.2f}\n\n"
+                append(
+                    f"### {insight.get('title')}\n"
+                    f"- Description: {insight.get('description')}\n"
+                    f"- Potential Savings: ${insight.get('potential_savings', 0):.2f}\n\n"
+                )
 
-        return report
+        return "".join(parts)
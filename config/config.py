@@ -5,7 +5,7 @@ Centralized configuration for the FinOps Chatbot
 
 import os
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 from dotenv import load_dotenv
 
 logging.basicConfig(level=logging.INFO)
@@ -14,6 +14,9 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Configuration keys whose values to_dict() never exposes
+SECRET_KEYS = frozenset({"AWS_SECRET_ACCESS_KEY", "MISTRAL_API_KEY", "SECRET_KEY", "JWT_SECRET"})
+
 
 class Config:
     """Base configuration class"""
@@ -40,6 +43,8 @@ class Config:
     # Database Configuration
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///finops.db")
     DATABASE_ECHO = os.getenv("DATABASE_ECHO", "False") == "True"
+    DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", 10))
+    DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", 20))
 
     # Logging Configuration
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -55,6 +60,8 @@ class Config:
     SYNC_INTERVAL_HOURS = int(os.getenv("SYNC_INTERVAL_HOURS", 24))
     SYNC_HOUR = int(os.getenv("SYNC_HOUR", 0))
     SYNC_MINUTE = int(os.getenv("SYNC_MINUTE", 0))
+    RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", 90))  # 0 disables pruning
+    RETENTION_INTERVAL_HOURS = float(os.getenv("RETENTION_INTERVAL_HOURS", 1))
 
     # Analytics Configuration
     ANOMALY_DETECTION_METHOD = os.getenv("ANOMALY_DETECTION_METHOD", "isolation_forest")
@@ -83,6 +90,23 @@ class Config:
     NOTIFICATION_EMAIL = os.getenv("NOTIFICATION_EMAIL", "")
     NOTIFICATION_WEBHOOK = os.getenv("NOTIFICATION_WEBHOOK", "")
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._PUBLIC_KEYS = cls._collect_public_keys()
+
+    @classmethod
+    def _collect_public_keys(cls) -> Tuple[str, ...]:
+        """
+        List the configuration keys of the class, in dir() order
+        
+        Run once per class at definition time, so to_dict() does not
+        reflect over the class on every call.
+        
+        Returns:
+            Tuple of upper-case attribute names
+        """
+        return tuple(key for key in dir(cls) if not key.startswith("_") and key.isupper())
+
     @classmethod
     def validate(cls) -> bool:
         """
@@ -116,16 +140,14 @@ class Config:
         Returns:
             Dictionary of configuration values
         """
-        config_dict = {}
-        for key in dir(cls):
-            if not key.startswith("_") and key.isupper():
-                value = getattr(cls, key)
-                # Don't include sensitive information
-                if key in ["AWS_SECRET_ACCESS_KEY", "MISTRAL_API_KEY", "SECRET_KEY", "JWT_SECRET"]:
-                    value = "***REDACTED***"
-                config_dict[key] = value
-
-        return config_dict
+        # Don't include sensitive information
+        return {
+            key: "***REDACTED***" if key in SECRET_KEYS else getattr(cls, key)
+            for key in cls._PUBLIC_KEYS
+        }
+
+
+Config._PUBLIC_KEYS = Config._collect_public_keys()
 
 
 class DevelopmentConfig(Config):
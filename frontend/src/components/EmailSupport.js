@@ -53,7 +53,7 @@ function EmailSupport() {
         message: formData.message
       });
 
-      if (response.data.status === 'success') {
+      if (response.data.status === 'success' || response.data.status === 'queued') {
         setStatus('success');
         setStatusMessage('Your inquiry has been sent to our support team!');
         